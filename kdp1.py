@@ -6,14 +6,18 @@ Versión mejorada con batch processing, detección automática de estructura y m
 from __future__ import annotations
 import sys
 import re
+import codecs
+import threading
+import html as html_lib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
 from PySide6.QtCore import Qt, QThread, Signal, QSize
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QPushButton, QTextEdit, QFileDialog, QLabel,
+    QLineEdit, QPushButton, QTextEdit, QPlainTextEdit, QFileDialog, QLabel,
     QProgressBar, QTabWidget, QListWidget, QSplitter, QGroupBox,
     QCheckBox, QSpinBox, QMessageBox, QComboBox
 )
@@ -22,6 +26,68 @@ from PySide6.QtGui import QFont, QTextCursor
 import requests
 from charset_normalizer import from_bytes
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+# Motor DFA opcional (pip install google-re2) para los regex por línea
+try:
+    import re2 as fast_re
+except ImportError:
+    fast_re = re
+
+# Caché HTTP persistente opcional (pip install requests-cache)
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# Parser lxml reutilizable (uno por hilo: los parsers no son thread-safe).
+# Comentarios e instrucciones se conservan: separan nodos de texto igual que
+# en bs4, y quitarlos al parsear pegaría el texto de ambos lados.
+_parser_local = threading.local()
+
+
+def _get_lxml_parser() -> lxml.html.HTMLParser:
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(huge_tree=True, encoding="utf-8")
+        _parser_local.parser = parser
+    return parser
+
+
+# Etiquetas cuyo texto no es contenido (bs4 tampoco lo devuelve en get_text)
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+def _text_nodes(root, skip: frozenset = _NON_TEXT_TAGS):
+    """Textos de root en orden de documento, un trozo por nodo como los strings de bs4.
+
+    No entra en las etiquetas de `skip` ni en comentarios, pero sí devuelve lo que
+    les sigue como un trozo aparte.
+    """
+    if root.text:
+        yield root.text
+    stack = [(iter(root), None)]
+    while stack:
+        it, tail = stack[-1]
+        child = next(it, None)
+        if child is None:
+            stack.pop()
+            if tail:
+                yield tail
+        elif isinstance(child.tag, str) and child.tag not in skip:
+            if child.text:
+                yield child.text
+            stack.append((iter(child), child.tail))
+        elif child.tail:
+            yield child.tail
+
+
+# Caracteres no válidos en nombres de archivo (los saltos de línea pasan a espacio)
+_FS_SANITIZE = str.maketrans({**{c: None for c in '<>:"/\\|?*\r'}, "\n": " "})
+
+# Prefijos (en mayúsculas) con los que puede empezar un encabezado de capítulo
+_CHAPTER_PREFIXES = ("CHAPTER", "CAPÍTULO", "CAP.", "PART")
 
 # ============================================================================
 # CORE FUNCTIONALITY
@@ -30,61 +96,215 @@ from bs4 import BeautifulSoup
 class BookFetcher:
     """Descarga y decodifica HTML/texto de manera robusta"""
     
-    @staticmethod
-    def fetch_url(url: str, timeout: int = 30) -> str:
+    META_CHARSET_RE = re.compile(
+        rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""",
+        re.IGNORECASE
+    )
+    SNIFF_BYTES = 4096
+    # Como indica WHATWG, las páginas que declaran latin-1 o ascii suelen ser
+    # cp1252 (comillas, guiones, '…'); leídas como latin-1 serían controles C1
+    CP1252_LABEL_CODECS = frozenset({"iso8859-1", "ascii"})
+    GUTENBERG_START_BYTES_RE = re.compile(rb"\*\*\*\s*START OF", re.IGNORECASE)
+    GUTENBERG_PROBE_BYTES = 200_000
+    
+    CACHE_DIR = Path.home() / ".kdp_cache"
+    CACHE_EXPIRE_SECONDS = 24 * 60 * 60
+    MEMORY_CACHE_SIZE = 64
+    
+    _session: Optional[requests.Session] = None
+    # url -> (ETag, Last-Modified, texto decodificado), en orden LRU
+    _memory_cache: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+    
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        if cls._session is None:
+            if requests_cache is not None:
+                cls._session = requests_cache.CachedSession(
+                    str(cls.CACHE_DIR),
+                    backend="sqlite",
+                    expire_after=cls.CACHE_EXPIRE_SECONDS
+                )
+            else:
+                cls._session = requests.Session()
+        return cls._session
+    
+    @classmethod
+    def fetch_url(cls, url: str, timeout: int = 30) -> str:
         headers = {
             "User-Agent": "Mozilla/5.0 (KDP-Editor/2.0; +https://example.local)"
         }
-        r = requests.get(url, headers=headers, timeout=timeout)
+        
+        # GET condicional: si el servidor responde 304 se reutiliza el texto
+        # ya decodificado sin volver a descargar ni a detectar el charset
+        cached = cls._memory_cache.get(url)
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        r = cls._get_session().get(url, headers=headers, timeout=timeout)
+        if r.status_code == 304 and cached is not None:
+            cls._memory_cache.move_to_end(url)
+            return cached[2]
         r.raise_for_status()
         
+        text = cls._decode_response(r)
+        
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        if etag or last_modified:
+            cls._memory_cache[url] = (etag, last_modified, text)
+            cls._memory_cache.move_to_end(url)
+            while len(cls._memory_cache) > cls.MEMORY_CACHE_SIZE:
+                cls._memory_cache.popitem(last=False)
+        
+        return text
+    
+    @classmethod
+    def _decode_response(cls, r: requests.Response) -> str:
         if r.encoding and r.encoding.lower() not in ["iso-8859-1", "windows-1252"]:
             return r.text
         
+        # El charset declarado en <meta> evita pasar todo el cuerpo por
+        # charset_normalizer, que es caro en libros de varios MB
+        text = cls._decode_with_meta_charset(r.content)
+        if text is not None:
+            return text
+        
+        # Libros de Gutenberg (marcador START en la cabecera): se prueba UTF-8
+        # estricto sobre los bytes antes de recurrir a la detección completa
+        if cls.GUTENBERG_START_BYTES_RE.search(r.content, 0, cls.GUTENBERG_PROBE_BYTES):
+            try:
+                return r.content.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        
         best = from_bytes(r.content).best()
         if best is None:
             return r.content.decode("utf-8", errors="replace")
         return str(best)
+    
+    @classmethod
+    def _decode_with_meta_charset(cls, data: bytes) -> Optional[str]:
+        m = cls.META_CHARSET_RE.search(data, 0, cls.SNIFF_BYTES)
+        if not m:
+            return None
+        try:
+            encoding = codecs.lookup(m.group(1).decode("ascii")).name
+            if encoding in cls.CP1252_LABEL_CODECS:
+                encoding = "cp1252"
+            return data.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            return None
 
 
 class BookExtractor:
     """Extrae texto limpio desde HTML con soporte especial para Gutenberg"""
     
-    GUTENBERG_START_RE = re.compile(
-        r"\*\*\*\s*START OF (THE )?PROJECT GUTENBERG EBOOK.*\*\*\*", 
-        re.IGNORECASE
-    )
-    GUTENBERG_END_RE = re.compile(
-        r"\*\*\*\s*END OF (THE )?PROJECT GUTENBERG EBOOK.*\*\*\*", 
+    # El cierre '.*\*\*\*' va en un lookahead para que un marcador no consuma
+    # al siguiente cuando ambos están en la misma línea
+    GUTENBERG_BOUNDARY_RE = re.compile(
+        r"\*\*\*\s*(START|END) OF (?:THE )?PROJECT GUTENBERG EBOOK(?=(.*\*\*\*))",
         re.IGNORECASE
     )
+    # Parte literal de ambos marcadores; al no tener \s nunca cruza nodos
+    GUTENBERG_MARKER_HINT_RE = re.compile(r"PROJECT GUTENBERG EBOOK", re.IGNORECASE)
+    
+    @classmethod
+    def _find_gutenberg_body(cls, text: str) -> Optional[Tuple[int, int]]:
+        """Devuelve (inicio, fin) del cuerpo entre marcadores START/END, si existen"""
+        # Ambos marcadores empiezan con '***': sin él no hace falta el regex
+        if "***" not in text:
+            return None
+        
+        start = end = None
+        for m in cls.GUTENBERG_BOUNDARY_RE.finditer(text):
+            if m.group(1).upper() == "START":
+                if start is None:
+                    start = m
+            elif end is None:
+                end = m
+            if start is not None and end is not None:
+                break
+        
+        if start and end and end.start() > start.end(2):
+            return start.end(2), end.start()
+        return None
     
     @classmethod
     def extract_main_text(cls, html: str) -> str:
         # Intento 1: Gutenberg directo en HTML
-        m1 = cls.GUTENBERG_START_RE.search(html)
-        m2 = cls.GUTENBERG_END_RE.search(html)
-        if m1 and m2 and m2.start() > m1.end():
-            chunk = html[m1.end():m2.start()]
+        bounds = cls._find_gutenberg_body(html)
+        if bounds:
+            chunk = html[bounds[0]:bounds[1]]
             if "<" in chunk and ">" in chunk:
-                soup = BeautifulSoup(chunk, "lxml")
-                return soup.get_text("\n")
+                tree = cls._parse(chunk)
+                if tree is None:
+                    return BeautifulSoup(chunk, "lxml").get_text("\n")
+                return "\n".join(_text_nodes(tree))
             return chunk
         
-        # Intento 2: parsear DOM y buscar marcadores
-        soup = BeautifulSoup(html, "lxml")
-        full_text = soup.get_text("\n")
-        m1 = cls.GUTENBERG_START_RE.search(full_text)
-        m2 = cls.GUTENBERG_END_RE.search(full_text)
-        if m1 and m2 and m2.start() > m1.end():
-            return full_text[m1.end():m2.start()]
+        # Intento 2: parsear DOM (una sola vez) y buscar marcadores; el mismo
+        # árbol se reutiliza para la extracción genérica
+        tree = cls._parse(html)
+        if tree is None:
+            return cls._soup_extract(html)
+        
+        # El texto completo solo se arma si algún nodo contiene el marcador;
+        # en páginas que no son de Gutenberg se evita materializar el libro
+        if any(cls.GUTENBERG_MARKER_HINT_RE.search(t) for t in _text_nodes(tree)):
+            full_text = "\n".join(_text_nodes(tree))
+            bounds = cls._find_gutenberg_body(full_text)
+            if bounds:
+                return full_text[bounds[0]:bounds[1]]
         
         # Fallback genérico: extraer contenido principal
-        return cls._generic_extract(soup)
+        return cls._generic_extract(tree)
     
     @staticmethod
-    def _generic_extract(soup: BeautifulSoup) -> str:
-        # Remover elementos no deseados
+    def _parse(html: str) -> Optional[lxml.html.HtmlElement]:
+        """Parsea con lxml; devuelve None si lxml no puede (entrada vacía, etc.)"""
+        try:
+            return etree.fromstring(html.encode("utf-8"), _get_lxml_parser())
+        except (etree.LxmlError, ValueError):
+            return None
+    
+    # Elementos no deseados en la extracción genérica (el texto que les sigue se conserva)
+    GENERIC_SKIP_TAGS = _NON_TEXT_TAGS | {"nav", "header", "footer", "aside"}
+    
+    @classmethod
+    def _generic_extract(cls, tree: lxml.html.HtmlElement) -> str:
+        skip = cls.GENERIC_SKIP_TAGS
+        out_lines: List[str] = []
+        for el in tree.iter("h1", "h2", "h3", "h4", "p", "blockquote", "li"):
+            # Sin quitar nodos del árbol: así el texto a ambos lados de lo omitido
+            # sigue en trozos separados y se une con espacio
+            if next(el.iterancestors(*skip), None) is not None:
+                continue
+            t = " ".join(s.strip() for s in _text_nodes(el, skip) if s.strip())
+            if not t:
+                continue
+            if el.tag in {"h1", "h2", "h3", "h4"}:
+                out_lines.append("")
+                out_lines.append(t.upper())
+                out_lines.append("")
+            else:
+                out_lines.append(t)
+                out_lines.append("")
+        
+        return "\n".join(out_lines).strip()
+    
+    @classmethod
+    def _soup_extract(cls, html: str) -> str:
+        """Ruta de respaldo con BeautifulSoup cuando lxml no puede parsear"""
+        soup = BeautifulSoup(html, "lxml")
+        full_text = soup.get_text("\n")
+        bounds = cls._find_gutenberg_body(full_text)
+        if bounds:
+            return full_text[bounds[0]:bounds[1]]
+        
         for tag in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside']):
             tag.decompose()
         
@@ -107,54 +327,73 @@ class BookExtractor:
 class BookCleaner:
     """Limpia y normaliza texto de libros"""
     
-    SEPARATOR_LINE_RE = re.compile(
-        r"^\s*(\*+\s*\*+\s*\*+|[-_=]{3,}|•{3,}|·{3,}|—{3,}|_{3,})\s*$"
+    # Patrones sin lookarounds ni backreferences: compatibles con re y re2.
+    # Los flags van inline porque re2 no acepta las constantes de re.
+    # Separadores o números sueltos sobre una línea ya recortada
+    DROP_LINE_RE = fast_re.compile(
+        r"^(?:\d+|\*+\s*\*+\s*\*+|[-_=]{3,}|•{3,}|·{3,}|—{3,})$"
     )
-    BARE_NUMBER_RE = re.compile(r"^\s*\d+\s*$")
-    MULTI_BLANKS_RE = re.compile(r"\n{3,}")
-    CHAPTER_RE = re.compile(
-        r"^(CHAPTER|CAPÍTULO|CAP\.|PARTE|PART)\s+([IVXLCDM]+|\d+)",
-        re.IGNORECASE
+    CHAPTER_RE = fast_re.compile(
+        r"(?i)^(CHAPTER|CAPÍTULO|CAP\.|PARTE|PART)\s+([IVXLCDM]+|\d+)"
+    )
+    # Igual que CHAPTER_RE pero para recorrer el texto completo de una vez:
+    # cada coincidencia es una línea entera, sin cruzar saltos de línea
+    CHAPTER_LINE_RE = fast_re.compile(
+        r"(?im)^[^\S\n]*((?:CHAPTER|CAPÍTULO|CAP\.|PARTE|PART)[^\S\n]+(?:[IVXLCDM]+|\d+)[^\n]*)"
     )
+    WORD_RE = re.compile(r"\S+")
+    NONBLANK_LINE_RE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
     
     @classmethod
     def clean_text(cls, text: str, aggressive: bool = False) -> str:
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
-        lines = text.split("\n")
+        # Una sola pasada: cada línea se emite ya recortada y los blancos
+        # repetidos se colapsan al vuelo. Solo \r\n, \r y \n cortan líneas
+        # (splitlines() cortaría también en \x85, \x0c o \u2028).
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
         cleaned: List[str] = []
+        blank_run = True  # True al inicio para no emitir blancos iniciales
         
-        for line in lines:
+        for line in text.split("\n"):
             s = line.replace("\u00a0", " ").strip()
             
-            # Quitar separadores
-            if cls.SEPARATOR_LINE_RE.match(s):
+            if not s:
+                if not blank_run:
+                    cleaned.append("")
+                    blank_run = True
                 continue
             
-            # Quitar números sueltos
-            if cls.BARE_NUMBER_RE.match(s):
+            # Quitar separadores y números sueltos
+            if cls.DROP_LINE_RE.match(s):
                 continue
             
             # Quitar líneas muy cortas con caracteres especiales
-            if len(s) > 0 and len(s) <= 2 and all(ch in "*-_=·•" for ch in s):
+            if len(s) <= 2 and all(ch in "*-_=·•" for ch in s):
                 continue
             
             # Modo agresivo: quitar líneas muy cortas
-            if aggressive and len(s) > 0 and len(s) < 10 and not cls.CHAPTER_RE.match(s):
+            if aggressive and len(s) < 10 and not cls.CHAPTER_RE.match(s):
                 continue
             
             cleaned.append(s)
+            blank_run = False
         
-        out = "\n".join(cleaned)
-        out = re.sub(r"[ \t]+\n", "\n", out)
-        out = re.sub(r"\n[ \t]+", "\n", out)
-        out = cls.MULTI_BLANKS_RE.sub("\n\n", out)
+        if cleaned and not cleaned[-1]:
+            cleaned.pop()
         
-        return out.strip() + "\n"
+        return "\n".join(cleaned) + "\n"
+    
+    @classmethod
+    def is_chapter_heading(cls, text: str) -> bool:
+        # Filtro barato por prefijo: la mayoría de párrafos no llega al regex
+        return (
+            text[:12].upper().startswith(_CHAPTER_PREFIXES)
+            and cls.CHAPTER_RE.match(text) is not None
+        )
     
     @classmethod
     def detect_structure(cls, text: str) -> Dict[str, any]:
         """Detecta título, autor y capítulos automáticamente"""
-        lines = text.split("\n")
         structure = {
             "title": None,
             "author": None,
@@ -163,54 +402,83 @@ class BookCleaner:
         }
         
         # Buscar título y autor en las primeras 50 líneas
-        for i, line in enumerate(lines[:50]):
+        for line in text.split("\n", 50)[:50]:
             line = line.strip()
             if not line:
                 continue
             
+            low = line.lower()
             if structure["title"] is None and len(line) > 5 and len(line) < 200:
                 structure["title"] = line
-            elif "by " in line.lower() or "por " in line.lower():
+            elif "by " in low or "por " in low:
                 structure["author"] = line
-            elif "translat" in line.lower() or "traducc" in line.lower():
+            elif "translat" in low or "traducc" in low:
                 structure["translator"] = line
         
-        # Buscar capítulos
-        for i, line in enumerate(lines):
-            if cls.CHAPTER_RE.match(line.strip()):
-                structure["chapters"].append({
-                    "line": i,
-                    "title": line.strip()
-                })
+        # Buscar capítulos: un solo recorrido del texto, contando saltos de
+        # línea solo entre coincidencias consecutivas
+        line_no = 0
+        last_pos = 0
+        for m in cls.CHAPTER_LINE_RE.finditer(text):
+            line_no += text.count("\n", last_pos, m.start())
+            last_pos = m.start()
+            structure["chapters"].append({
+                "line": line_no,
+                "title": m.group(1).strip()
+            })
         
         return structure
+    
+    @classmethod
+    def compute_stats(cls, text: str) -> Dict[str, int]:
+        """Cuenta caracteres, palabras, líneas y párrafos sin partir el texto en palabras"""
+        paragraph_chars = 0
+        paragraphs = 0
+        for p in text.split("\n\n"):
+            if p.strip():
+                paragraphs += 1
+                paragraph_chars += len(p)
+        
+        return {
+            "chars": len(text),
+            "chars_no_spaces": len(text) - text.count(" ") - text.count("\n"),
+            "words": sum(1 for _ in cls.WORD_RE.finditer(text)),
+            "lines": sum(1 for _ in cls.NONBLANK_LINE_RE.finditer(text)),
+            "paragraphs": paragraphs,
+            "paragraph_chars": paragraph_chars,
+        }
 
 
 class BookExporter:
     """Exporta libros a diferentes formatos"""
     
+    # Párrafo = líneas no vacías consecutivas; recorre el texto sin split()
+    PARAGRAPH_RE = re.compile(r"[^\n]+(?:\n[^\n]+)*")
+    
     @staticmethod
     def export_txt(text: str, path: Path) -> None:
         path.write_text(text, encoding="utf-8")
     
     @staticmethod
     def export_html(text: str, path: Path, title: str = "Libro") -> None:
-        paragraphs = text.split("\n\n")
-        html_body = ""
+        body_parts: List[str] = []
+        esc = html_lib.escape
         
-        for para in paragraphs:
-            para = para.strip()
+        for m in BookExporter.PARAGRAPH_RE.finditer(text):
+            para = m.group(0).strip()
             if not para:
                 continue
             
-            if BookCleaner.CHAPTER_RE.match(para):
-                html_body += f"<h2>{para}</h2>\n"
+            if BookCleaner.is_chapter_heading(para):
+                body_parts.append(f"<h2>{esc(para, quote=False)}</h2>\n")
             elif len(para) < 100 and para.isupper():
-                html_body += f"<h3>{para}</h3>\n"
+                body_parts.append(f"<h3>{esc(para, quote=False)}</h3>\n")
             else:
-                para_html = para.replace("\n", "<br>\n")
-                html_body += f"<p>{para_html}</p>\n"
+                para_html = esc(para, quote=False).replace("\n", "<br>\n")
+                body_parts.append(f"<p>{para_html}</p>\n")
         
+        html_body = "".join(body_parts)
+        title = esc(title, quote=True)
         html = f"""<!DOCTYPE html>
 <html lang="es">
 <head>
@@ -244,27 +512,26 @@ class BookExporter:
     
     @staticmethod
     def export_markdown(text: str, path: Path, structure: Dict = None) -> None:
-        paragraphs = text.split("\n\n")
-        md_content = ""
+        md_parts: List[str] = []
         
         if structure and structure.get("title"):
-            md_content += f"# {structure['title']}\n\n"
+            md_parts.append(f"# {structure['title']}\n\n")
             if structure.get("author"):
-                md_content += f"**{structure['author']}**\n\n"
+                md_parts.append(f"**{structure['author']}**\n\n")
         
-        for para in paragraphs:
-            para = para.strip()
+        for m in BookExporter.PARAGRAPH_RE.finditer(text):
+            para = m.group(0).strip()
             if not para:
                 continue
             
-            if BookCleaner.CHAPTER_RE.match(para):
-                md_content += f"\n## {para}\n\n"
+            if BookCleaner.is_chapter_heading(para):
+                md_parts.append(f"\n## {para}\n\n")
             elif len(para) < 100 and para.isupper():
-                md_content += f"### {para}\n\n"
+                md_parts.append(f"### {para}\n\n")
             else:
-                md_content += f"{para}\n\n"
+                md_parts.append(f"{para}\n\n")
         
-        path.write_text(md_content, encoding="utf-8")
+        path.write_text("".join(md_parts), encoding="utf-8")
 
 
 # ============================================================================
@@ -275,7 +542,7 @@ class ProcessWorker(QThread):
     """Worker thread para procesar URLs sin bloquear la UI"""
     
     progress = Signal(int, str)
-    finished = Signal(str, dict)
+    finished = Signal(str, dict, dict)
     error = Signal(str)
     
     def __init__(self, url: str, aggressive: bool = False):
@@ -296,9 +563,10 @@ class ProcessWorker(QThread):
             
             self.progress.emit(90, "Analizando estructura...")
             structure = BookCleaner.detect_structure(cleaned)
+            stats = BookCleaner.compute_stats(cleaned)
             
             self.progress.emit(100, "¡Completado!")
-            self.finished.emit(cleaned, structure)
+            self.finished.emit(cleaned, structure, stats)
             
         except Exception as e:
             self.error.emit(str(e))
@@ -320,7 +588,7 @@ QMainWindow {
     border-radius: 20px;
 }
 
-QLineEdit, QTextEdit {
+QLineEdit, QTextEdit, QPlainTextEdit {
     background: rgba(255, 255, 255, 0.10);
     border: 1px solid rgba(255, 255, 255, 0.18);
     border-radius: 12px;
@@ -458,6 +726,29 @@ QListWidget::item:selected {
 # MAIN WINDOW
 # ============================================================================
 
+_STATS_TMPL = """
+    📊 ESTADÍSTICAS DEL TEXTO
+    ==================================================
+
+    📝 Contenido:
+       • Caracteres (con espacios): {chars:,}
+       • Caracteres (sin espacios): {chars_no_spaces:,}
+       • Palabras: {words:,}
+       • Líneas: {lines:,}
+       • Párrafos: {paragraphs:,}
+
+    📏 Promedios:
+       • Palabras por línea: {words_per_line:.1f}
+       • Caracteres por párrafo: {avg_para_length:.0f}
+       • Palabras por párrafo: {words_per_para:.1f}
+
+    📖 Estimaciones de lectura:
+       • Tiempo (250 ppm): {reading_minutes:.0f} minutos
+       • Páginas (250 palabras/pág): {pages:.0f} páginas
+
+    ==================================================
+    """
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -578,12 +869,15 @@ class MainWindow(QMainWindow):
         tabs = QTabWidget()
         
         # Tab 1: Preview
-        self.preview = QTextEdit()
+        # QPlainTextEdit: modelo plano, mucho más liviano que QTextEdit
+        # para libros de varios MB
+        self.preview = QPlainTextEdit()
         self.preview.setPlaceholderText("Aquí aparecerá el texto limpio del libro...\n\n"
                                        "📚 Soporta Project Gutenberg y otros sitios HTML\n"
                                        "✨ Limpieza automática de separadores y basura\n"
                                        "🎯 Detección de estructura (título, autor, capítulos)")
         self.preview.setFont(QFont("Georgia", 11))
+        self.preview.setLineWrapMode(QPlainTextEdit.NoWrap)
         tabs.addTab(self.preview, "📄 Vista Previa")
         
         # Tab 2: Estructura
@@ -688,7 +982,7 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(value)
         self.status_label.setText(message)
     
-    def on_finished(self, text: str, structure: Dict):
+    def on_finished(self, text: str, structure: Dict, stats: Dict):
         self._last_text = text
         self._last_structure = structure
         
@@ -704,12 +998,16 @@ class MainWindow(QMainWindow):
                 info += f"{structure['translator']}\n"
             self.structure_info.setPlainText(info)
         
-        # Mostrar capítulos
-        for chapter in structure["chapters"]:
-            self.chapters_list.addItem(f"Línea {chapter['line']}: {chapter['title']}")
+        # Mostrar capítulos (en bloque: un solo relayout de la lista)
+        self.chapters_list.setUpdatesEnabled(False)
+        self.chapters_list.addItems([
+            f"Línea {chapter['line']}: {chapter['title']}"
+            for chapter in structure["chapters"]
+        ])
+        self.chapters_list.setUpdatesEnabled(True)
         
         # Mostrar estadísticas
-        self._show_stats(text)
+        self._show_stats(stats)
         
         # Habilitar botones
         self.btn_copy.setEnabled(True)
@@ -734,8 +1032,7 @@ class MainWindow(QMainWindow):
             if self._last_structure and self._last_structure.get("title"):
                 title = self._last_structure["title"]
                 # Limpiar título para nombre de archivo
-                title = re.sub(r'[<>:"/\\|?*]', '', title)
-                title = title.replace('\n', ' ').replace('\r', '')
+                title = title.translate(_FS_SANITIZE)
                 default_name = title[:80].strip()
             
             # Obtener formato
@@ -780,42 +1077,25 @@ class MainWindow(QMainWindow):
         self.preview.setPlainText(f"Error al procesar:\n\n{error_msg}")
         QMessageBox.critical(self, "Error", f"No se pudo procesar el libro:\n\n{error_msg}")
     
-        def _show_stats(self, text: str):
-        lines = [l for l in text.splitlines() if l.strip()]
-        words = text.split()
-        chars = len(text)
-        chars_no_spaces = len(text.replace(" ", "").replace("\n", ""))
-
-        paragraphs = [p for p in text.split("\n\n") if p.strip()]
-
-        avg_para_length = (sum(len(p) for p in paragraphs) / len(paragraphs)) if paragraphs else 0
-
-        words_per_line = (len(words) / len(lines)) if lines else 0
-        words_per_para = (len(words) / len(paragraphs)) if paragraphs else 0
-
-        stats = f"""
-    📊 ESTADÍSTICAS DEL TEXTO
-    {'='*50}
-
-    📝 Contenido:
-       • Caracteres (con espacios): {chars:,}
-       • Caracteres (sin espacios): {chars_no_spaces:,}
-       • Palabras: {len(words):,}
-       • Líneas: {len(lines):,}
-       • Párrafos: {len(paragraphs):,}
-
-    📏 Promedios:
-       • Palabras por línea: {words_per_line:.1f}
-       • Caracteres por párrafo: {avg_para_length:.0f}
-       • Palabras por párrafo: {words_per_para:.1f}
-
-    📖 Estimaciones de lectura:
-       • Tiempo (250 ppm): {len(words) / 250:.0f} minutos
-       • Páginas (250 palabras/pág): {len(words) / 250:.0f} páginas
-
-    {'='*50}
-    """
-        self.stats_text.setPlainText(stats)
+    def _show_stats(self, stats: Dict):
+        words = stats["words"]
+        lines = stats["lines"]
+        paragraphs = stats["paragraphs"]
+        
+        avg_para_length = (stats["paragraph_chars"] / paragraphs) if paragraphs else 0
+        
+        words_per_line = (words / lines) if lines else 0
+        words_per_para = (words / paragraphs) if paragraphs else 0
+        
+        text = _STATS_TMPL.format_map({
+            **stats,
+            "avg_para_length": avg_para_length,
+            "words_per_line": words_per_line,
+            "words_per_para": words_per_para,
+            "reading_minutes": words / 250,
+            "pages": words / 250,
+        })
+        self.stats_text.setPlainText(text)
     
     def on_copy(self):
         if not self._last_text:
@@ -0,0 +1,189 @@
+"""
+HTTP download helpers and the on-disk download cache shared by kdpsimple
+(single Gutenberg pages) and kdpsimplescraper (Gutenberg pages and whole
+Wikisource works).
+
+No Qt or bs4 dependency; urllib3 is optional (pip install urllib3) and only
+adds connection reuse.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Optional
+
+try:
+    import urllib3
+except Exception:
+    urllib3 = None
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) GutenbergCleaner/1.0"
+
+# One pool per process: every download from a host already visited (each chapter of
+# a Wikisource work, a second Gutenberg book) reuses the kept-alive connection
+# instead of a new TCP+TLS handshake. maxsize matches the scraper's fetch workers.
+# Gutenberg serves gzip; textual HTML shrinks ~4x on the wire.
+_POOL = (
+    urllib3.PoolManager(
+        maxsize=8, block=False, headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+    )
+    if urllib3 is not None
+    else None
+)
+
+
+def _read_body(resp) -> bytes:
+    """Read a urllib response, preallocating from Content-Length when known."""
+    length = resp.headers.get("Content-Length")
+    if not length or not length.isdigit():
+        return resp.read()
+
+    n = int(length)
+    buf = bytearray(n)
+    mv = memoryview(buf)
+    off = 0
+    while off < n:
+        k = resp.readinto(mv[off:])
+        if not k:
+            break
+        off += k
+    mv.release()
+    if off < n:
+        del buf[off:]
+    return bytes(buf)
+
+
+def download(url: str, timeout: int, headers: dict[str, str]):
+    """GET url; (body, response headers), or (None, headers) for 304 Not Modified."""
+    if _POOL is not None:
+        # Per-request headers replace the pool's defaults rather than adding to them.
+        resp = _POOL.request("GET", url, timeout=timeout, headers={**_POOL.headers, **headers})
+        if resp.status == 304:
+            return None, resp.headers
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return resp.data, resp.headers
+
+    req = urllib.request.Request(
+        url, headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", **headers}
+    )
+    try:
+        resp = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, e.headers
+        raise
+    with resp:
+        data = _read_body(resp)
+        if resp.headers.get("Content-Encoding", "").lower() == "gzip":
+            data = gzip.decompress(data)
+        return data, resp.headers
+
+
+# Downloads are kept on disk, keyed by URL, so converting the same book again, or
+# re-running a Wikisource work in the scraper, doesn't go back to the network. Both
+# apps share the directory, which is per user (next to kdp1's cache) and private:
+# entries are served without further checks. Entries older than FETCH_CACHE_MAX_AGE
+# are revalidated with ETag / Last-Modified; a 304 just refreshes them. Set
+# FETCH_CACHE_DIR to None to disable.
+FETCH_CACHE_DIR: Optional[pathlib.Path] = pathlib.Path.home() / ".kdp_cache" / "fetch"
+FETCH_CACHE_MAX_AGE = 24 * 3600  # seconds
+# Pruned once per process: entries not refreshed for FETCH_CACHE_KEEP seconds go,
+# then the oldest ones until the rest fit in FETCH_CACHE_MAX_BYTES.
+FETCH_CACHE_KEEP = 30 * 24 * 3600
+FETCH_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_cache_pruned = False
+
+
+def fetch_url_bytes(url: str, timeout: int = 30) -> bytes:
+    global _cache_pruned
+    if FETCH_CACHE_DIR is None:
+        return download(url, timeout, {})[0] or b""
+
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    body_path = FETCH_CACHE_DIR / key
+    meta_path = FETCH_CACHE_DIR / f"{key}.json"
+
+    validators: dict[str, str] = {}
+    try:
+        if time.time() - body_path.stat().st_mtime < FETCH_CACHE_MAX_AGE:
+            return body_path.read_bytes()
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("etag"):
+            validators["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            validators["If-Modified-Since"] = meta["last_modified"]
+    except (OSError, ValueError):
+        pass  # no usable entry: plain download
+
+    data, headers = download(url, timeout, validators)
+    if data is None:  # 304: the cached copy is still current
+        try:
+            data = body_path.read_bytes()
+            os.utime(body_path)
+            return data
+        except OSError:
+            return download(url, timeout, {})[0] or b""
+
+    try:
+        FETCH_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _cache_pruned:
+            _cache_pruned = True
+            _prune_cache(FETCH_CACHE_DIR)
+        _write_atomic(body_path, data)
+        meta = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass  # the cache is best-effort; the download itself succeeded
+    return data
+
+
+def _prune_cache(cache_dir: pathlib.Path) -> None:
+    entries = []
+    for path in cache_dir.iterdir():
+        if path.suffix == ".json":
+            continue  # removed along with its body
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+
+    now = time.time()
+    total = 0
+    for mtime, size, path in sorted(entries, reverse=True):  # newest first
+        if now - mtime < FETCH_CACHE_KEEP and total + size <= FETCH_CACHE_MAX_BYTES:
+            total += size
+            continue
+        for stale in (path, path.with_name(f"{path.name}.json")):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _write_atomic(path: pathlib.Path, data: bytes) -> None:
+    # Write a sibling temp file and rename it over the entry, so two fetches of the
+    # same URL at once (the scraper downloads in parallel; both apps share the
+    # directory) or an interrupted run never leave a half-written file behind.
+    fd, tmp = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -9,60 +9,94 @@ Goals:
 - Repair classic mojibake (UTF-8 mis-decoded as Latin-1/CP1252)
 - Export UTF-8 .txt
 
+The extraction code has no Qt dependency; the UI lives in kdpsimple_ui.py and is
+only imported when this file is run as a script.
+
 Install:
-  pip install pyside6 beautifulsoup4 charset-normalizer
+  pip install pyside6 beautifulsoup4 charset-normalizer lxml
 
 Run:
-  python gutenberg_cleaner_app.py
+  python kdpsimple.py  (or python kdpsimple_ui.py)
 """
 
 from __future__ import annotations
 
 import html as html_lib
-import pathlib
 import re
-import sys
-import urllib.request
 from dataclasses import dataclass
 from typing import Optional
 
-from bs4 import BeautifulSoup, NavigableString, Tag
-from PySide6 import QtCore, QtWidgets
+from bs4 import BeautifulSoup, NavigableString, PageElement, Tag
 
 try:
     from charset_normalizer import from_bytes as cn_from_bytes
 except Exception:
     cn_from_bytes = None
 
+# lxml is much faster than the pure-Python html.parser; use it when available.
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except Exception:
+    PARSER = "html.parser"
+
 
 # ------------------------------
 # Text utilities
 # ------------------------------
 
 MOJIBAKE_HINT_RE = re.compile(r"[ÃÂâ€˜â€™â€œâ€�â€¢â€¦]|\\x[0-9a-fA-F]{2}")
+MULTI_SPACE_RE = re.compile(r"[ ]{2,}")
+MULTI_NL_RE = re.compile(r"\n{3,}")
+QUAD_NL_RE = re.compile(r"\n{4,}")
+CR_RE = re.compile(r"\r\n?")
+# Not "\r": mapping it per char would turn CRLF into two newlines; see normalize_newlines.
+KEEPNL_SPACE_TRANS = str.maketrans({"\u00a0": " ", "\t": " ", "\f": " ", "\v": " "})
+SINGLELINE_SPACE_TRANS = str.maketrans(dict.fromkeys("\u00a0\r\n\t\f\v", " "))
 
 def repair_mojibake(s: str) -> str:
     """Repair classic 'UTF-8 bytes decoded as Latin-1' mojibake."""
     if not s:
         return s
+    # Pure ASCII can't be mojibake (and the roundtrip would be a no-op).
+    if s.isascii():
+        return s
+    # Anything above U+00FF can't survive the Latin-1 roundtrip. The encoder stops
+    # at the first such char (most real books have curly quotes), so check it
+    # before paying for a full regex scan of the document.
+    try:
+        raw = s.encode("latin-1", errors="strict")
+    except Exception:
+        return s
     if not MOJIBAKE_HINT_RE.search(s):
         return s
     try:
-        repaired = s.encode("latin-1", errors="strict").decode("utf-8", errors="strict")
+        repaired = raw.decode("utf-8", errors="strict")
         return repaired
     except Exception:
         return s
 
 
+def normalize_newlines(s: str) -> str:
+    """CRLF / lone CR -> LF in one pass; no copy when there is no CR at all."""
+    if "\r" not in s:
+        return s
+    return CR_RE.sub("\n", s)
+
+
+def normalize_block_newlines(s: str) -> str:
+    """Newline cleanup for pre/blockquote/poetry text: LF endings, at most one blank line."""
+    return MULTI_NL_RE.sub("\n\n", normalize_newlines(s))
+
+
 def normalize_spaces_keep_newlines(s: str) -> str:
     """Normalize whitespace but keep \n. Good for poetry/pre/quotes."""
     if not s:
         return s
-    s = s.replace("\u00a0", " ")  # NBSP
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = re.sub(r"[\t\f\v]+", " ", s)
+    s = s.translate(KEEPNL_SPACE_TRANS)  # NBSP, tabs, FF, VT -> space
+    s = normalize_newlines(s)
     # collapse multiple spaces (not newlines)
-    s = re.sub(r"[ ]{2,}", " ", s)
+    s = MULTI_SPACE_RE.sub(" ", s)
     return s
 
 
@@ -70,10 +104,9 @@ def normalize_spaces_singleline(s: str) -> str:
     """Normalize whitespace and collapse any newlines to spaces. Good for normal paragraphs."""
     if not s:
         return s
-    s = s.replace("\u00a0", " ")
-    s = s.replace("\r\n", " ").replace("\r", " ").replace("\n", " ")
-    s = re.sub(r"[\t\f\v]+", " ", s)
-    s = re.sub(r"[ ]{2,}", " ", s)
+    # CRLF becomes two spaces here, which the run collapse folds back into one.
+    s = s.translate(SINGLELINE_SPACE_TRANS)
+    s = MULTI_SPACE_RE.sub(" ", s)
     return s.strip()
 
 
@@ -81,15 +114,6 @@ def strip_line(s: str) -> str:
     return s.strip(" \t")
 
 
-def is_noise_line(line: str) -> bool:
-    """Conservative: keep most content. Extend if you want to drop Gutenberg boilerplate."""
-    t = line.strip()
-    if not t:
-        return False
-    # Don't aggressively remove; false positives are expensive.
-    return False
-
-
 # ------------------------------
 # Extraction options
 # ------------------------------
@@ -106,38 +130,73 @@ POETRY_CLASS_HINTS = {"poetry", "verse", "stanza", "poem"}
 
 
 def looks_like_poetry_block(tag: Tag) -> bool:
-    cls = " ".join(tag.get("class", [])).lower()
-    if any(h in cls for h in POETRY_CLASS_HINTS):
-        return True
-    # Gutenberg often: <div class="poetry"> or <p class="poetry">
-    if tag.name in {"div", "p"} and "poetry" in cls:
-        return True
+    # Gutenberg often: <div class="poem">, <div class="stanza"> or <p class="poetry">.
+    # Hints match inside a token too (e.g. "poem-container"); exact tokens hit the set first.
+    for c in tag.get("class") or ():
+        cl = c.lower()
+        if cl in POETRY_CLASS_HINTS or any(h in cl for h in POETRY_CLASS_HINTS):
+            return True
     return False
 
 
+# Scripts/styles/nav, plus images/figures (text-only export).
+DROP_TAG_NAMES = frozenset({"script", "style", "nav", "header", "footer", "img", "svg", "figure"})
+# Obvious PG header/footer blocks (on <div> only).
+DROP_DIV_IDS = frozenset({"pg-header", "pg-footer"})
+
+
 def remove_non_content(soup: BeautifulSoup) -> None:
-    # Drop scripts/styles/nav.
-    for bad in soup.select("script, style, nav, header, footer"):
-        bad.decompose()
+    # One walk over the tree instead of three CSS selects; a dropped subtree
+    # is skipped as a whole.
+    if not soup.contents:
+        return
+    node = soup.contents[0]
+    while node is not None:
+        if isinstance(node, Tag) and (
+            node.name in DROP_TAG_NAMES
+            or (node.name == "div" and node.get("id") in DROP_DIV_IDS)
+        ):
+            nxt = _element_after(node)
+            node.decompose()
+            node = nxt
+        else:
+            node = node.next_element
+
+
+def _element_after(node: PageElement) -> Optional[PageElement]:
+    """The first element past node and its descendants, in document order."""
+    while node is not None:
+        if node.next_sibling is not None:
+            return node.next_sibling
+        node = node.parent
+    return None
 
-    # Drop obvious PG header/footer blocks if present.
-    for bad in soup.select("div#pg-header, div#pg-footer"):
-        bad.decompose()
 
-    # Remove images/figures (text-only export)
-    for bad in soup.select("img, svg, figure"):
-        bad.decompose()
+# Candidate book containers, in priority order: ("id" | "class", value) on a <div>.
+MAIN_CONTAINER_SELECTORS = (
+    ("id", "body"), ("id", "main"), ("id", "content"), ("id", "pg-body"),
+    ("id", "book"), ("class", "book"), ("id", "text"), ("class", "text"),
+    ("id", "chapter"), ("class", "chapter"),
+)
+MAIN_CONTAINER_IDS = frozenset(v for k, v in MAIN_CONTAINER_SELECTORS if k == "id")
+MAIN_CONTAINER_CLASSES = frozenset(v for k, v in MAIN_CONTAINER_SELECTORS if k == "class")
 
 
 def select_main_container(soup: BeautifulSoup) -> Tag:
     """Pick best container for actual book body; fallback to <body>."""
-    selectors = [
-        "div#body", "div#main", "div#content", "div#pg-body",
-        "div#book", "div.book", "div#text", "div.text",
-        "div#chapter", "div.chapter"
-    ]
-    for sel in selectors:
-        t = soup.select_one(sel)
+    # One pass over the <div>s records the first match for every candidate,
+    # instead of a full CSS-select walk per selector.
+    first: dict[tuple[str, str], Tag] = {}
+    for div in soup.find_all("div"):
+        div_id = div.get("id")
+        if div_id in MAIN_CONTAINER_IDS:
+            first.setdefault(("id", div_id), div)
+        for c in div.get("class") or ():
+            if c in MAIN_CONTAINER_CLASSES:
+                first.setdefault(("class", c), div)
+
+    for key in MAIN_CONTAINER_SELECTORS:
+        t = first.get(key)
         if t and len(t.get_text(strip=True)) > 1000:
             return t
     return soup.body if soup.body else soup
@@ -147,20 +206,22 @@ def select_main_container(soup: BeautifulSoup) -> Tag:
 # Core extraction
 # ------------------------------
 
-BLOCK_TAGS = ["h1","h2","h3","h4","h5","p","pre","blockquote","ul","ol","hr","div"]
+CHILD_BLOCK_TAGS = frozenset({"p","h1","h2","h3","h4","h5","pre","ul","ol","blockquote"})
 
 def extract_clean_text(html_text: str, opt: ExtractOptions) -> str:
     """Convert Gutenberg-ish HTML into clean TXT while preserving structure."""
 
     html_text = repair_mojibake(html_text)
 
-    soup = BeautifulSoup(html_text, "html.parser")
+    soup = BeautifulSoup(html_text, PARSER)
     remove_non_content(soup)
     container = select_main_container(soup)
 
     blocks: list[str] = []
+    section_break = False
 
     def add_block(text_in: str, preserve_newlines: bool) -> None:
+        nonlocal section_break
         if not text_in:
             return
         t = html_lib.unescape(text_in)
@@ -169,119 +230,123 @@ def extract_clean_text(html_text: str, opt: ExtractOptions) -> str:
         if preserve_newlines:
             t = normalize_spaces_keep_newlines(t)
             lines = [strip_line(x) for x in t.split("\n")]
-            # trim outer empty lines
-            while lines and not lines[0]:
-                lines.pop(0)
-            while lines and not lines[-1]:
-                lines.pop()
-            if not lines:
+            # trim outer empty lines with one slice
+            start, end = 0, len(lines)
+            while start < end and not lines[start]:
+                start += 1
+            if start == end:
                 return
-            # conservative noise filtering line by line
-            lines = [ln for ln in lines if not is_noise_line(ln)]
-            if not lines:
-                return
-            block = "\n".join(lines)
+            while not lines[end - 1]:
+                end -= 1
+            block = "\n".join(lines[start:end])
+            # reduce excessive blank lines, then strip trailing spaces per line
+            # (strip_line only took " \t"; this drops Unicode spaces such as U+3000.
+            # A [^\S\n]+(?=\n|\Z) sweep gives the same result but is ~10x slower.)
+            if "\n\n\n\n" in block:
+                block = QUAD_NL_RE.sub("\n\n\n", block)
+            block = "\n".join([line.rstrip() for line in block.split("\n")])
         else:
             block = normalize_spaces_singleline(t)
             if not block:
                 return
 
+        # An <hr> between blocks becomes one extra blank line, however many there are.
+        if section_break and blocks:
+            block = "\n" + block
+        section_break = False
         blocks.append(block)
 
-    def handle(tag: Tag) -> None:
-        name = (tag.name or "").lower()
-
-        # headings
-        if name in {"h1","h2","h3","h4","h5"}:
-            txt = tag.get_text(" ", strip=True)
-            if txt:
-                add_block(txt.upper() if len(txt) <= 80 else txt, preserve_newlines=False)
-            return
+    # Block handlers, dispatched on the tag name. Each returns True if the tag's
+    # whole subtree is accounted for.
+    def handle_heading(tag: Tag) -> bool:
+        txt = tag.get_text(" ", strip=True)
+        if txt:
+            add_block(txt.upper() if len(txt) <= 80 else txt, preserve_newlines=False)
+        return True
 
-        if name == "hr":
-            blocks.append("")  # section break
-            return
+    def handle_hr(tag: Tag) -> bool:
+        nonlocal section_break
+        section_break = True
+        return True
 
-        if name in {"ul","ol"}:
-            items = []
-            for li in tag.find_all("li", recursive=False):
-                it = li.get_text(" ", strip=True)
-                if it:
-                    items.append(f"- {it}")
-            if items:
-                add_block("\n".join(items), preserve_newlines=True)
-            return
+    def handle_list(tag: Tag) -> bool:
+        items = []
+        for li in tag.find_all("li", recursive=False):
+            it = li.get_text(" ", strip=True)
+            if it:
+                items.append(f"- {it}")
+        if items:
+            add_block("\n".join(items), preserve_newlines=True)
+        # Only <li> text was taken; stray child tags still need their own visit.
+        return all(child.name == "li" for child in tag.children if isinstance(child, Tag))
+
+    def handle_pre(tag: Tag) -> bool:
+        if opt.preserve_preformatted:
+            add_block(normalize_block_newlines(tag.get_text("\n", strip=False)), preserve_newlines=True)
+            return True
+        return handle_poetry(tag)
+
+    def handle_blockquote(tag: Tag) -> bool:
+        add_block(normalize_block_newlines(tag.get_text("\n", strip=False)), preserve_newlines=True)
+        return True
 
-        if name == "pre" and opt.preserve_preformatted:
-            txt = tag.get_text("\n", strip=False)
-            txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-            txt = re.sub(r"\n{3,}", "\n\n", txt)
-            add_block(txt, preserve_newlines=True)
-            return
+    # Poetry-like blocks
+    def handle_poetry(tag: Tag) -> bool:
+        if opt.preserve_poetry and looks_like_poetry_block(tag):
+            # keep <br> as newline
+            add_block(normalize_block_newlines(tag.get_text("\n", strip=False)), preserve_newlines=True)
+            return True
+        return False
 
-        if name == "blockquote":
+    # paragraph-ish: p and some divs
+    def handle_paragraph(tag: Tag) -> bool:
+        if handle_poetry(tag):
+            return True
+        # Avoid flattening container divs that hold other blocks directly
+        is_div = tag.name == "div"
+        if is_div:
+            if any(child.name in CHILD_BLOCK_TAGS for child in tag.children):
+                return False  # container: walk into its blocks
+
+        if opt.keep_br_as_newline and tag.find("br") is not None:
             txt = tag.get_text("\n", strip=False)
-            txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-            txt = re.sub(r"\n{3,}", "\n\n", txt)
-            add_block(txt, preserve_newlines=True)
-            return
-
-        # Poetry-like blocks
-        if opt.preserve_poetry and looks_like_poetry_block(tag):
-            txt = tag.get_text("\n", strip=False)  # keep <br> as newline
-            txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-            txt = re.sub(r"\n{3,}", "\n\n", txt)
             add_block(txt, preserve_newlines=True)
-            return
-
-        # paragraph-ish: p and some divs
-        if name in {"p","div"}:
-            # Avoid flattening container divs that hold other blocks directly
-            if name == "div":
-                nested = tag.find(
-                    ["p","h1","h2","h3","h4","h5","pre","ul","ol","blockquote"],
-                    recursive=False
-                )
-                if nested is not None:
-                    return
-
-            br_count = len(tag.find_all("br"))
-            if opt.keep_br_as_newline and br_count > 0:
-                txt = tag.get_text("\n", strip=False)
-                add_block(txt, preserve_newlines=True)
-            else:
-                # IMPORTANT: do NOT preserve accidental newlines inside paragraph.
-                txt = tag.get_text(" ", strip=False)
-                add_block(txt, preserve_newlines=False)
-            return
+        else:
+            # IMPORTANT: do NOT preserve accidental newlines inside paragraph.
+            txt = tag.get_text(" ", strip=False)
+            add_block(txt, preserve_newlines=False)
+        # A div only checks direct children for blocks, so deeper ones still get a turn.
+        return not is_div
+
+    handlers = dict.fromkeys(("h1", "h2", "h3", "h4", "h5"), handle_heading)
+    handlers.update(
+        hr=handle_hr, ul=handle_list, ol=handle_list, pre=handle_pre,
+        blockquote=handle_blockquote, p=handle_paragraph, div=handle_paragraph,
+    )
 
     # Safer traversal: process only meaningful block tags in document order.
-    # Using find_all keeps order, avoids .descendants double-processing text.
-    for el in container.find_all(BLOCK_TAGS):
+    # Pre-order walk that skips the subtree of any block a handler already emitted
+    # in full, so nested blocks (li > ul, poem > stanza, blockquote > p) aren't repeated.
+    stack = container.contents[::-1]
+    while stack:
+        el = stack.pop()
         if isinstance(el, Tag):
-            handle(el)
+            fn = handlers.get(el.name)
+            if fn is not None and fn(el):
+                continue
+            stack.extend(el.contents[::-1])
 
     # Stitch with blank lines between blocks
-    out = "\n\n".join([b for b in blocks if b is not None])
-    # reduce excessive blank lines
-    out = re.sub(r"\n{4,}", "\n\n\n", out)
-    # strip trailing spaces per line
-    out = "\n".join([line.rstrip() for line in out.split("\n")])
-
-    return out.strip() + "\n"
+    return "\n\n".join(blocks).strip() + "\n"
 
 
 # ------------------------------
 # Download / load helpers
 # ------------------------------
 
-def fetch_url_bytes(url: str, timeout: int = 30) -> bytes:
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) GutenbergCleaner/1.0"},
-    )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return resp.read()
+# charset_normalizer cost grows with input size and candidate count.
+CHARSET_SNIFF_BYTES = 64 * 1024
+CHARSET_CANDIDATES = ["cp1252", "latin_1", "iso8859_15", "utf_16"]
 
 
 def decode_html_bytes(data: bytes) -> str:
@@ -293,273 +358,23 @@ def decode_html_bytes(data: bytes) -> str:
 
     if cn_from_bytes is not None:
         try:
-            best = cn_from_bytes(data).best()
+            # UTF-8 already failed; sniff a prefix among the encodings non-UTF-8
+            # books actually use, then decode the whole payload with the winner.
+            best = cn_from_bytes(data[:CHARSET_SNIFF_BYTES], cp_isolation=CHARSET_CANDIDATES).best()
             if best is not None:
-                return str(best)
+                return data.decode(best.encoding, errors="replace")
         except Exception:
             pass
 
     return data.decode("cp1252", errors="replace")
 
 
-# ------------------------------
-# UI
-# ------------------------------
-
-class GlassButton(QtWidgets.QPushButton):
-    def __init__(self, text: str):
-        super().__init__(text)
-        self.setCursor(QtCore.Qt.PointingHandCursor)
-        self.setMinimumHeight(40)
-
-
-class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Gutenberg HTML → Clean TXT (UTF-8)")
-        self.resize(980, 680)
-        self._last_text: Optional[str] = None
-        self._build_ui()
-
-    def _build_ui(self):
-        central = QtWidgets.QWidget()
-        central.setObjectName("bg")
-        self.setCentralWidget(central)
-
-        root = QtWidgets.QVBoxLayout(central)
-        root.setContentsMargins(18, 18, 18, 18)
-        root.setSpacing(12)
-
-        title = QtWidgets.QLabel("Gutenberg HTML Cleaner")
-        title.setStyleSheet("font-size: 22px; font-weight: 700;")
-
-        subtitle = QtWidgets.QLabel(
-            "Descarga HTML o carga un archivo local, extrae texto útil y exporta TXT UTF-8.\n"
-            "Colapsa saltos accidentales en párrafos (fix 'by / nature') y preserva poesía/pre/citas."
-        )
-        subtitle.setStyleSheet("opacity: 0.85;")
-        subtitle.setWordWrap(True)
-
-        card = QtWidgets.QFrame()
-        card.setObjectName("card")
-        card_layout = QtWidgets.QVBoxLayout(card)
-        card_layout.setContentsMargins(16, 16, 16, 16)
-        card_layout.setSpacing(10)
-
-        # URL row
-        url_row = QtWidgets.QHBoxLayout()
-        self.url_edit = QtWidgets.QLineEdit()
-        self.url_edit.setPlaceholderText("Pega el URL HTML (ej: https://www.gutenberg.org/files/10661/10661-h/10661-h.htm)")
-        self.url_edit.setText("https://www.gutenberg.org/files/10661/10661-h/10661-h.htm")
-        self.btn_download = GlassButton("Descargar + Convertir")
-        self.btn_download.clicked.connect(self.on_download_convert)
-        url_row.addWidget(self.url_edit, 1)
-        url_row.addWidget(self.btn_download, 0)
-
-        # Local file row
-        file_row = QtWidgets.QHBoxLayout()
-        self.file_edit = QtWidgets.QLineEdit()
-        self.file_edit.setPlaceholderText("…o carga un .htm/.html local")
-        self.btn_browse = GlassButton("Elegir archivo")
-        self.btn_browse.clicked.connect(self.on_browse)
-        self.btn_convert_file = GlassButton("Convertir archivo")
-        self.btn_convert_file.clicked.connect(self.on_convert_file)
-        file_row.addWidget(self.file_edit, 1)
-        file_row.addWidget(self.btn_browse, 0)
-        file_row.addWidget(self.btn_convert_file, 0)
-
-        # Output row
-        out_row = QtWidgets.QHBoxLayout()
-        self.out_edit = QtWidgets.QLineEdit()
-        self.out_edit.setPlaceholderText("Ruta de salida .txt")
-        self.out_edit.setText(str(pathlib.Path.cwd() / "book_clean.txt"))
-        self.btn_out = GlassButton("Elegir salida")
-        self.btn_out.clicked.connect(self.on_choose_output)
-        self.btn_save = GlassButton("Guardar TXT")
-        self.btn_save.clicked.connect(self.on_save)
-        self.btn_save.setEnabled(False)
-        out_row.addWidget(self.out_edit, 1)
-        out_row.addWidget(self.btn_out, 0)
-        out_row.addWidget(self.btn_save, 0)
-
-        # Options
-        opt_grid = QtWidgets.QGridLayout()
-        self.cb_pre = QtWidgets.QCheckBox("Preservar <pre> (poesía/tablas)")
-        self.cb_pre.setChecked(True)
-        self.cb_poetry = QtWidgets.QCheckBox("Detectar bloques de poesía")
-        self.cb_poetry.setChecked(True)
-        self.cb_br = QtWidgets.QCheckBox("Respetar <br> como salto de línea")
-        self.cb_br.setChecked(True)
-
-        opt_grid.addWidget(self.cb_pre, 0, 0)
-        opt_grid.addWidget(self.cb_poetry, 0, 1)
-        opt_grid.addWidget(self.cb_br, 1, 0)
-
-        # Preview
-        self.preview = QtWidgets.QPlainTextEdit()
-        self.preview.setPlaceholderText("Aquí aparecerá el texto limpio…")
-        self.preview.setMinimumHeight(280)
-        self.preview.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
-
-        self.status = QtWidgets.QLabel("Listo.")
-        self.status.setStyleSheet("opacity: 0.8;")
-
-        card_layout.addLayout(url_row)
-        card_layout.addLayout(file_row)
-        card_layout.addLayout(out_row)
-        card_layout.addLayout(opt_grid)
-        card_layout.addWidget(self.preview)
-        card_layout.addWidget(self.status)
-
-        root.addWidget(title)
-        root.addWidget(subtitle)
-        root.addWidget(card, 1)
-
-        self.setStyleSheet(
-            """
-            QWidget#bg {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(40, 20, 70, 255),
-                    stop:1 rgba(15, 60, 65, 255)
-                );
-                color: rgba(245,245,245,235);
-                font-family: Segoe UI;
-                font-size: 13px;
-            }
-            QFrame#card {
-                background: rgba(255,255,255,18);
-                border: 1px solid rgba(255,255,255,28);
-                border-radius: 18px;
-            }
-            QLineEdit, QPlainTextEdit {
-                background: rgba(0,0,0,55);
-                border: 1px solid rgba(255,255,255,25);
-                border-radius: 12px;
-                padding: 10px;
-                selection-background-color: rgba(255,255,255,60);
-            }
-            QPlainTextEdit { border-radius: 14px; }
-            QPushButton {
-                background: rgba(255,255,255,18);
-                border: 1px solid rgba(255,255,255,28);
-                border-radius: 12px;
-                padding: 10px 14px;
-                font-weight: 600;
-            }
-            QPushButton:hover { background: rgba(255,255,255,26); }
-            QPushButton:pressed { background: rgba(255,255,255,14); }
-            QPushButton:disabled {
-                background: rgba(255,255,255,10);
-                color: rgba(255,255,255,120);
-            }
-            QCheckBox { spacing: 8px; }
-            """
-        )
-
-    def _options(self) -> ExtractOptions:
-        return ExtractOptions(
-            keep_br_as_newline=self.cb_br.isChecked(),
-            preserve_preformatted=self.cb_pre.isChecked(),
-            preserve_poetry=self.cb_poetry.isChecked(),
-        )
-
-    def _set_busy(self, busy: bool, msg: str = ""):
-        self.btn_download.setEnabled(not busy)
-        self.btn_browse.setEnabled(not busy)
-        self.btn_convert_file.setEnabled(not busy)
-        self.btn_out.setEnabled(not busy)
-        self.btn_save.setEnabled((not busy) and bool(self._last_text))
-        if msg:
-            self.status.setText(msg)
-
-    def on_browse(self):
-        path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Elegir HTML", "", "HTML (*.htm *.html);;All (*.*)"
-        )
-        if path:
-            self.file_edit.setText(path)
-
-    def on_choose_output(self):
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(
-            self, "Guardar TXT", self.out_edit.text(), "Text (*.txt)"
-        )
-        if path:
-            if not path.lower().endswith(".txt"):
-                path += ".txt"
-            self.out_edit.setText(path)
-
-    def on_convert_file(self):
-        path = self.file_edit.text().strip()
-        if not path:
-            self.status.setText("No hay archivo local seleccionado.")
-            return
-
-        p = pathlib.Path(path)
-        if not p.exists():
-            self.status.setText("Ese archivo no existe.")
-            return
-
-        self._set_busy(True, "Leyendo archivo…")
-        QtWidgets.QApplication.processEvents()
-
-        data = p.read_bytes()
-        html_text = decode_html_bytes(data)
-        cleaned = extract_clean_text(html_text, self._options())
-
-        self._last_text = cleaned
-        self.preview.setPlainText(cleaned)
-        self._set_busy(False, f"Convertido desde archivo. Líneas: {cleaned.count(chr(10))}")
-        self.btn_save.setEnabled(True)
-
-    def on_download_convert(self):
-        url = self.url_edit.text().strip()
-        if not url:
-            self.status.setText("Pega un URL primero.")
-            return
-
-        self._set_busy(True, "Descargando HTML…")
-        QtWidgets.QApplication.processEvents()
-
-        try:
-            data = fetch_url_bytes(url)
-        except Exception as e:
-            self._set_busy(False, f"Fallo descargando: {e}")
-            return
-
-        self._set_busy(True, "Decodificando + limpiando…")
-        QtWidgets.QApplication.processEvents()
-
-        html_text = decode_html_bytes(data)
-        cleaned = extract_clean_text(html_text, self._options())
-
-        self._last_text = cleaned
-        self.preview.setPlainText(cleaned)
-        self._set_busy(False, f"Listo. Caracteres: {len(cleaned):,} | Líneas: {cleaned.count(chr(10))}")
-        self.btn_save.setEnabled(True)
-
-    def on_save(self):
-        if not self._last_text:
-            self.status.setText("Nada que guardar.")
-            return
-
-        out_path = pathlib.Path(self.out_edit.text().strip())
-        if not out_path.parent.exists():
-            self.status.setText("Carpeta de salida no existe.")
-            return
-
-        try:
-            out_path.write_text(self._last_text, encoding="utf-8", newline="\n")
-            self.status.setText(f"Guardado: {out_path} (UTF-8)")
-        except Exception as e:
-            self.status.setText(f"Error guardando: {e}")
-
-
-def main():
-    app = QtWidgets.QApplication(sys.argv)
-    w = MainWindow()
-    w.show()
-    sys.exit(app.exec())
+if __name__ == "__main__":
+    import sys
 
+    # kdpsimple_ui does "from kdpsimple import ...": point that at this module so
+    # the file isn't loaded a second time. Qt is only imported here.
+    sys.modules.setdefault("kdpsimple", sys.modules[__name__])
+    from kdpsimple_ui import main
 
-if __name__ == "__main__":
     main()
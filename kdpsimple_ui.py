@@ -0,0 +1,317 @@
+"""
+PySide6 UI for kdpsimple (Gutenberg HTML → clean TXT).
+
+Kept apart from the extraction code so scripts that only need extract_clean_text
+don't load Qt. Run it through kdpsimple.py, or directly:
+  python kdpsimple_ui.py
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from typing import Optional
+
+from PySide6 import QtCore, QtWidgets
+
+from kdpfetch import fetch_url_bytes
+from kdpsimple import ExtractOptions, decode_html_bytes, extract_clean_text
+
+
+class WorkerSignals(QtCore.QObject):
+    status = QtCore.Signal(str)
+    finished = QtCore.Signal(str, str)  # text, status message
+    error = QtCore.Signal(str)
+
+
+class ExtractWorker(QtCore.QRunnable):
+    """Runs a download/extract job on the global thread pool so the UI stays responsive.
+
+    `job(status)` returns (text, status message); an empty text leaves the preview untouched.
+    """
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            text, msg = self.job(self.signals.status.emit)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(text, msg)
+
+
+class GlassButton(QtWidgets.QPushButton):
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.setCursor(QtCore.Qt.PointingHandCursor)
+        self.setMinimumHeight(40)
+
+
+class MainWindow(QtWidgets.QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Gutenberg HTML → Clean TXT (UTF-8)")
+        self.resize(980, 680)
+        self._last_text: Optional[str] = None
+        self._worker: Optional[ExtractWorker] = None
+        self._build_ui()
+
+    def _build_ui(self):
+        central = QtWidgets.QWidget()
+        central.setObjectName("bg")
+        self.setCentralWidget(central)
+
+        root = QtWidgets.QVBoxLayout(central)
+        root.setContentsMargins(18, 18, 18, 18)
+        root.setSpacing(12)
+
+        title = QtWidgets.QLabel("Gutenberg HTML Cleaner")
+        title.setStyleSheet("font-size: 22px; font-weight: 700;")
+
+        subtitle = QtWidgets.QLabel(
+            "Descarga HTML o carga un archivo local, extrae texto útil y exporta TXT UTF-8.\n"
+            "Colapsa saltos accidentales en párrafos (fix 'by / nature') y preserva poesía/pre/citas."
+        )
+        subtitle.setStyleSheet("opacity: 0.85;")
+        subtitle.setWordWrap(True)
+
+        card = QtWidgets.QFrame()
+        card.setObjectName("card")
+        card_layout = QtWidgets.QVBoxLayout(card)
+        card_layout.setContentsMargins(16, 16, 16, 16)
+        card_layout.setSpacing(10)
+
+        # URL row
+        url_row = QtWidgets.QHBoxLayout()
+        self.url_edit = QtWidgets.QLineEdit()
+        self.url_edit.setPlaceholderText("Pega el URL HTML (ej: https://www.gutenberg.org/files/10661/10661-h/10661-h.htm)")
+        self.url_edit.setText("https://www.gutenberg.org/files/10661/10661-h/10661-h.htm")
+        self.btn_download = GlassButton("Descargar + Convertir")
+        self.btn_download.clicked.connect(self.on_download_convert)
+        url_row.addWidget(self.url_edit, 1)
+        url_row.addWidget(self.btn_download, 0)
+
+        # Local file row
+        file_row = QtWidgets.QHBoxLayout()
+        self.file_edit = QtWidgets.QLineEdit()
+        self.file_edit.setPlaceholderText("…o carga un .htm/.html local")
+        self.btn_browse = GlassButton("Elegir archivo")
+        self.btn_browse.clicked.connect(self.on_browse)
+        self.btn_convert_file = GlassButton("Convertir archivo")
+        self.btn_convert_file.clicked.connect(self.on_convert_file)
+        file_row.addWidget(self.file_edit, 1)
+        file_row.addWidget(self.btn_browse, 0)
+        file_row.addWidget(self.btn_convert_file, 0)
+
+        # Output row
+        out_row = QtWidgets.QHBoxLayout()
+        self.out_edit = QtWidgets.QLineEdit()
+        self.out_edit.setPlaceholderText("Ruta de salida .txt")
+        self.out_edit.setText(str(pathlib.Path.cwd() / "book_clean.txt"))
+        self.btn_out = GlassButton("Elegir salida")
+        self.btn_out.clicked.connect(self.on_choose_output)
+        self.btn_save = GlassButton("Guardar TXT")
+        self.btn_save.clicked.connect(self.on_save)
+        self.btn_save.setEnabled(False)
+        out_row.addWidget(self.out_edit, 1)
+        out_row.addWidget(self.btn_out, 0)
+        out_row.addWidget(self.btn_save, 0)
+
+        # Options
+        opt_grid = QtWidgets.QGridLayout()
+        self.cb_pre = QtWidgets.QCheckBox("Preservar <pre> (poesía/tablas)")
+        self.cb_pre.setChecked(True)
+        self.cb_poetry = QtWidgets.QCheckBox("Detectar bloques de poesía")
+        self.cb_poetry.setChecked(True)
+        self.cb_br = QtWidgets.QCheckBox("Respetar <br> como salto de línea")
+        self.cb_br.setChecked(True)
+
+        opt_grid.addWidget(self.cb_pre, 0, 0)
+        opt_grid.addWidget(self.cb_poetry, 0, 1)
+        opt_grid.addWidget(self.cb_br, 1, 0)
+
+        # Preview
+        self.preview = QtWidgets.QPlainTextEdit()
+        self.preview.setPlaceholderText("Aquí aparecerá el texto limpio…")
+        self.preview.setMinimumHeight(280)
+        self.preview.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+
+        self.status = QtWidgets.QLabel("Listo.")
+        self.status.setStyleSheet("opacity: 0.8;")
+
+        card_layout.addLayout(url_row)
+        card_layout.addLayout(file_row)
+        card_layout.addLayout(out_row)
+        card_layout.addLayout(opt_grid)
+        card_layout.addWidget(self.preview)
+        card_layout.addWidget(self.status)
+
+        root.addWidget(title)
+        root.addWidget(subtitle)
+        root.addWidget(card, 1)
+
+        self.setStyleSheet(
+            """
+            QWidget#bg {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                    stop:0 rgba(40, 20, 70, 255),
+                    stop:1 rgba(15, 60, 65, 255)
+                );
+                color: rgba(245,245,245,235);
+                font-family: Segoe UI;
+                font-size: 13px;
+            }
+            QFrame#card {
+                background: rgba(255,255,255,18);
+                border: 1px solid rgba(255,255,255,28);
+                border-radius: 18px;
+            }
+            QLineEdit, QPlainTextEdit {
+                background: rgba(0,0,0,55);
+                border: 1px solid rgba(255,255,255,25);
+                border-radius: 12px;
+                padding: 10px;
+                selection-background-color: rgba(255,255,255,60);
+            }
+            QPlainTextEdit { border-radius: 14px; }
+            QPushButton {
+                background: rgba(255,255,255,18);
+                border: 1px solid rgba(255,255,255,28);
+                border-radius: 12px;
+                padding: 10px 14px;
+                font-weight: 600;
+            }
+            QPushButton:hover { background: rgba(255,255,255,26); }
+            QPushButton:pressed { background: rgba(255,255,255,14); }
+            QPushButton:disabled {
+                background: rgba(255,255,255,10);
+                color: rgba(255,255,255,120);
+            }
+            QCheckBox { spacing: 8px; }
+            """
+        )
+
+    def _options(self) -> ExtractOptions:
+        return ExtractOptions(
+            keep_br_as_newline=self.cb_br.isChecked(),
+            preserve_preformatted=self.cb_pre.isChecked(),
+            preserve_poetry=self.cb_poetry.isChecked(),
+        )
+
+    def _set_busy(self, busy: bool, msg: str = ""):
+        self.btn_download.setEnabled(not busy)
+        self.btn_browse.setEnabled(not busy)
+        self.btn_convert_file.setEnabled(not busy)
+        self.btn_out.setEnabled(not busy)
+        self.btn_save.setEnabled((not busy) and bool(self._last_text))
+        if msg:
+            self.status.setText(msg)
+
+    def on_browse(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Elegir HTML", "", "HTML (*.htm *.html);;All (*.*)"
+        )
+        if path:
+            self.file_edit.setText(path)
+
+    def on_choose_output(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Guardar TXT", self.out_edit.text(), "Text (*.txt)"
+        )
+        if path:
+            if not path.lower().endswith(".txt"):
+                path += ".txt"
+            self.out_edit.setText(path)
+
+    def _start_worker(self, job, busy_msg: str) -> None:
+        self._set_busy(True, busy_msg)
+        worker = ExtractWorker(job)
+        worker.signals.status.connect(self.status.setText, QtCore.Qt.QueuedConnection)
+        worker.signals.finished.connect(self._on_worker_finished, QtCore.Qt.QueuedConnection)
+        worker.signals.error.connect(self._on_worker_error, QtCore.Qt.QueuedConnection)
+        self._worker = worker
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_worker_finished(self, text: str, msg: str) -> None:
+        self._worker = None
+        if text:
+            self._last_text = text
+            self.preview.setPlainText(text)
+        self._set_busy(False, msg)
+
+    def _on_worker_error(self, msg: str) -> None:
+        self._worker = None
+        self._set_busy(False, f"Error: {msg}")
+
+    def on_convert_file(self):
+        path = self.file_edit.text().strip()
+        if not path:
+            self.status.setText("No hay archivo local seleccionado.")
+            return
+
+        p = pathlib.Path(path)
+        if not p.exists():
+            self.status.setText("Ese archivo no existe.")
+            return
+
+        opt = self._options()
+
+        def job(status):
+            html_text = decode_html_bytes(p.read_bytes())
+            cleaned = extract_clean_text(html_text, opt)
+            return cleaned, f"Convertido desde archivo. Líneas: {cleaned.count(chr(10))}"
+
+        self._start_worker(job, "Leyendo archivo…")
+
+    def on_download_convert(self):
+        url = self.url_edit.text().strip()
+        if not url:
+            self.status.setText("Pega un URL primero.")
+            return
+
+        opt = self._options()
+
+        def job(status):
+            try:
+                data = fetch_url_bytes(url)
+            except Exception as e:
+                return "", f"Fallo descargando: {e}"
+
+            status("Decodificando + limpiando…")
+            html_text = decode_html_bytes(data)
+            del data  # don't hold the raw bytes while parsing
+            cleaned = extract_clean_text(html_text, opt)
+            return cleaned, f"Listo. Caracteres: {len(cleaned):,} | Líneas: {cleaned.count(chr(10))}"
+
+        self._start_worker(job, "Descargando HTML…")
+
+    def on_save(self):
+        if not self._last_text:
+            self.status.setText("Nada que guardar.")
+            return
+
+        out_path = pathlib.Path(self.out_edit.text().strip())
+        if not out_path.parent.exists():
+            self.status.setText("Carpeta de salida no existe.")
+            return
+
+        try:
+            out_path.write_text(self._last_text, encoding="utf-8", newline="\n")
+            self.status.setText(f"Guardado: {out_path} (UTF-8)")
+        except Exception as e:
+            self.status.setText(f"Error guardando: {e}")
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+    w = MainWindow()
+    w.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -9,458 +9,73 @@ Goals:
 - Repair classic mojibake (UTF-8 mis-decoded as Latin-1/CP1252)
 - Export UTF-8 .txt
 
+The extraction and Wikisource code has no Qt dependency and lives in
+kdpsimplescraper_core.py; this file holds the window.
+
 Install:
-  pip install pyside6 beautifulsoup4 charset-normalizer
+  pip install pyside6 beautifulsoup4 charset-normalizer lxml
+  pip install selectolax  # optional, faster Wikisource link scan
 
 Run:
-  python gutenberg_cleaner_app.py
+  python kdpsimplescraper.py
 """
 
 from __future__ import annotations
 
-import html as html_lib
 import pathlib
-import re
+import shutil
 import sys
-import urllib.request
-from urllib.parse import urljoin, urlparse, urlunparse
-from dataclasses import dataclass
+import tempfile
 from typing import Optional
 
-from bs4 import BeautifulSoup, NavigableString, Tag
 from PySide6 import QtCore, QtWidgets
 
-try:
-    from charset_normalizer import from_bytes as cn_from_bytes
-except Exception:
-    cn_from_bytes = None
-
-
-# ------------------------------
-# Text utilities
-# ------------------------------
-
-MOJIBAKE_HINT_RE = re.compile(r"[ÃÂâ€˜â€™â€œâ€�â€¢â€¦]|\\x[0-9a-fA-F]{2}")
-
-def repair_mojibake(s: str) -> str:
-    """Repair classic 'UTF-8 bytes decoded as Latin-1' mojibake."""
-    if not s:
-        return s
-    if not MOJIBAKE_HINT_RE.search(s):
-        return s
-    try:
-        repaired = s.encode("latin-1", errors="strict").decode("utf-8", errors="strict")
-        return repaired
-    except Exception:
-        return s
-
-
-def normalize_spaces_keep_newlines(s: str) -> str:
-    """Normalize whitespace but keep \n. Good for poetry/pre/quotes."""
-    if not s:
-        return s
-    s = s.replace("\u00a0", " ")  # NBSP
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = re.sub(r"[\t\f\v]+", " ", s)
-    # collapse multiple spaces (not newlines)
-    s = re.sub(r"[ ]{2,}", " ", s)
-    return s
-
-
-def normalize_spaces_singleline(s: str) -> str:
-    """Normalize whitespace and collapse any newlines to spaces. Good for normal paragraphs."""
-    if not s:
-        return s
-    s = s.replace("\u00a0", " ")
-    s = s.replace("\r\n", " ").replace("\r", " ").replace("\n", " ")
-    s = re.sub(r"[\t\f\v]+", " ", s)
-    s = re.sub(r"[ ]{2,}", " ", s)
-    return s.strip()
-
-
-def strip_line(s: str) -> str:
-    return s.strip(" \t")
-
-
-def is_noise_line(line: str) -> bool:
-    """Conservative: keep most content. Extend if you want to drop Gutenberg boilerplate."""
-    t = line.strip()
-    if not t:
-        return False
-    # Don't aggressively remove; false positives are expensive.
-    return False
-
-
-# ------------------------------
-# Extraction options
-# ------------------------------
-
-@dataclass
-class ExtractOptions:
-    keep_br_as_newline: bool = True
-    preserve_preformatted: bool = True
-    preserve_poetry: bool = True
-    keep_footnotes: bool = True  # placeholder; you can wire this later
-
-
-POETRY_CLASS_HINTS = {"poetry", "verse", "stanza", "poem"}
-
-
-def looks_like_poetry_block(tag: Tag) -> bool:
-    cls = " ".join(tag.get("class", [])).lower()
-    if any(h in cls for h in POETRY_CLASS_HINTS):
-        return True
-    # Gutenberg often: <div class="poetry"> or <p class="poetry">
-    if tag.name in {"div", "p"} and "poetry" in cls:
-        return True
-    return False
-
-
-def remove_non_content(soup: BeautifulSoup) -> None:
-    # Drop scripts/styles/nav.
-    for bad in soup.select("script, style, nav, header, footer"):
-        bad.decompose()
-
-    # Drop obvious PG header/footer blocks if present.
-    for bad in soup.select("div#pg-header, div#pg-footer"):
-        bad.decompose()
-
-    # Remove images/figures (text-only export)
-    for bad in soup.select("img, svg, figure"):
-        bad.decompose()
-
-
-def select_main_container(soup: BeautifulSoup) -> Tag:
-    """Pick best container for actual book body; fallback to <body>."""
-    selectors = [
-        "div#body", "div#main", "div#content", "div#pg-body",
-        "div#book", "div.book", "div#text", "div.text",
-        "div#chapter", "div.chapter"
-    ]
-    for sel in selectors:
-        t = soup.select_one(sel)
-        if t and len(t.get_text(strip=True)) > 1000:
-            return t
-    return soup.body if soup.body else soup
+from kdpfetch import fetch_url_bytes
+from kdpsimplescraper_core import (
+    ExtractOptions,
+    decode_html_bytes,
+    extract_clean_text,
+    format_wikisource_section,
+    is_wikisource_url,
+    iter_wikisource_chapters,
+)
 
 
 # ------------------------------
-# Core extraction
+# UI
 # ------------------------------
 
-BLOCK_TAGS = ["h1","h2","h3","h4","h5","p","pre","blockquote","ul","ol","hr","div"]
-NESTED_BLOCK_TAGS = ["h1","h2","h3","h4","h5","p","pre","blockquote","ul","ol","hr"]
-
-def extract_clean_text(html_text: str, opt: ExtractOptions) -> str:
-    """Convert Gutenberg-ish HTML into clean TXT while preserving structure."""
-
-    html_text = repair_mojibake(html_text)
-
-    soup = BeautifulSoup(html_text, "html.parser")
-    remove_non_content(soup)
-    container = select_main_container(soup)
-
-    blocks: list[str] = []
-
-    def add_block(text_in: str, preserve_newlines: bool) -> None:
-        if not text_in:
-            return
-        t = html_lib.unescape(text_in)
-        t = repair_mojibake(t)
-
-        if preserve_newlines:
-            t = normalize_spaces_keep_newlines(t)
-            lines = [strip_line(x) for x in t.split("\n")]
-            # trim outer empty lines
-            while lines and not lines[0]:
-                lines.pop(0)
-            while lines and not lines[-1]:
-                lines.pop()
-            if not lines:
-                return
-            # conservative noise filtering line by line
-            lines = [ln for ln in lines if not is_noise_line(ln)]
-            if not lines:
-                return
-            block = "\n".join(lines)
-        else:
-            block = normalize_spaces_singleline(t)
-            if not block:
-                return
-
-        blocks.append(block)
-
-    def handle(tag: Tag) -> None:
-        name = (tag.name or "").lower()
-
-        # headings
-        if name in {"h1","h2","h3","h4","h5"}:
-            txt = tag.get_text(" ", strip=True)
-            if txt:
-                add_block(txt.upper() if len(txt) <= 80 else txt, preserve_newlines=False)
-            return
-
-        if name == "hr":
-            blocks.append("")  # section break
-            return
-
-        if name in {"ul","ol"}:
-            items = []
-            for li in tag.find_all("li", recursive=False):
-                it = li.get_text(" ", strip=True)
-                if it:
-                    items.append(f"- {it}")
-            if items:
-                add_block("\n".join(items), preserve_newlines=True)
-            return
-
-        if name == "pre" and opt.preserve_preformatted:
-            txt = tag.get_text("\n", strip=False)
-            txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-            txt = re.sub(r"\n{3,}", "\n\n", txt)
-            add_block(txt, preserve_newlines=True)
-            return
-
-        if name == "blockquote":
-            txt = tag.get_text("\n", strip=False)
-            txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-            txt = re.sub(r"\n{3,}", "\n\n", txt)
-            add_block(txt, preserve_newlines=True)
-            return
-
-        # Poetry-like blocks
-        if opt.preserve_poetry and looks_like_poetry_block(tag):
-            txt = tag.get_text("\n", strip=False)  # keep <br> as newline
-            txt = txt.replace("\r\n", "\n").replace("\r", "\n")
-            txt = re.sub(r"\n{3,}", "\n\n", txt)
-            add_block(txt, preserve_newlines=True)
-            return
-
-        # paragraph-ish: p and some divs
-        if name in {"p","div"}:
-            # Avoid flattening container divs that hold other blocks directly
-            if name == "div":
-                nested = tag.find(NESTED_BLOCK_TAGS, recursive=True)
-                if nested is not None:
-                    return
-
-            br_count = len(tag.find_all("br"))
-            if opt.keep_br_as_newline and br_count > 0:
-                txt = tag.get_text("\n", strip=False)
-                add_block(txt, preserve_newlines=True)
-            else:
-                # IMPORTANT: do NOT preserve accidental newlines inside paragraph.
-                txt = tag.get_text(" ", strip=False)
-                add_block(txt, preserve_newlines=False)
-            return
-
-    # Safer traversal: process only meaningful block tags in document order.
-    # Using find_all keeps order, avoids .descendants double-processing text.
-    for el in container.find_all(BLOCK_TAGS):
-        if isinstance(el, Tag):
-            handle(el)
-
-    # Stitch with blank lines between blocks
-    out = "\n\n".join([b for b in blocks if b is not None])
-    # reduce excessive blank lines
-    out = re.sub(r"\n{4,}", "\n\n\n", out)
-    # strip trailing spaces per line
-    out = "\n".join([line.rstrip() for line in out.split("\n")])
+# Large results (whole Wikisource works) are kept on disk; the preview shows this much.
+PREVIEW_CHARS = 200_000
 
-    return out.strip() + "\n"
 
+class WorkerSignals(QtCore.QObject):
+    status = QtCore.Signal(str)
+    finished = QtCore.Signal(str, str, str)  # text, status message, result file ("" if none)
+    error = QtCore.Signal(str)
 
-# ------------------------------
-# Download / load helpers
-# ------------------------------
 
-def fetch_url_bytes(url: str, timeout: int = 30) -> bytes:
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) GutenbergCleaner/1.0"},
-    )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return resp.read()
+class ExtractWorker(QtCore.QRunnable):
+    """Runs a download/extract job on the global thread pool so the UI stays responsive.
 
+    `job(status)` returns (text, status message, result file). An empty text leaves the
+    preview untouched; a result file means the full text lives on disk and text is a preview.
+    """
 
-def decode_html_bytes(data: bytes) -> str:
-    """Decode bytes robustly, favoring UTF-8 (what Gutenberg uses)."""
-    try:
-        return data.decode("utf-8", errors="strict")
-    except Exception:
-        pass
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = WorkerSignals()
 
-    if cn_from_bytes is not None:
+    def run(self):
         try:
-            best = cn_from_bytes(data).best()
-            if best is not None:
-                return str(best)
-        except Exception:
-            pass
-
-    return data.decode("cp1252", errors="replace")
-
-
-WIKISOURCE_EXCLUDED_NAMESPACES = {
-    "special",
-    "help",
-    "file",
-    "category",
-    "talk",
-    "template",
-    "portal",
-}
-
-WIKISOURCE_TEXT_NOISE = (
-    "retrieved from",
-    "public domain",
-    "categories",
-)
-
-
-def _strip_fragment(url: str) -> str:
-    parsed = urlparse(url)
-    return urlunparse(parsed._replace(fragment=""))
-
-
-def _ensure_action_render(url: str) -> str:
-    parsed = urlparse(url)
-    query = parsed.query
-    if "action=render" in query:
-        return url
-    new_query = f"{query}&action=render" if query else "action=render"
-    return urlunparse(parsed._replace(query=new_query))
-
-
-def _is_wikisource_url(url: str) -> bool:
-    parsed = urlparse(url)
-    host = parsed.netloc.lower()
-    return host == "wikisource.org" or host.endswith(".wikisource.org")
-
-
-def extract_wikisource_chapter_links(html_text: str, base_url: str) -> list[str]:
-    soup = BeautifulSoup(html_text, "html.parser")
-    container = soup.select_one("#mw-content-text") or soup.select_one("div#content") or soup
-    base_parsed = urlparse(base_url)
-    base_root = f"{base_parsed.scheme}://{base_parsed.netloc}"
-    links: list[str] = []
-    seen: set[str] = set()
-
-    for a in container.select("a[href]"):
-        href = a.get("href", "").strip()
-        if not href:
-            continue
-        if href.startswith("/wiki/"):
-            href = href
-        elif href.startswith(base_root + "/wiki/"):
-            href = href[len(base_root):]
-        else:
-            continue
-
-        href = _strip_fragment(href)
-        title = href.split("/wiki/", 1)[-1]
-        if ":" in title:
-            namespace = title.split(":", 1)[0].lower()
-            if namespace in WIKISOURCE_EXCLUDED_NAMESPACES:
-                continue
-
-        abs_url = urljoin(base_root, href)
-        if urlparse(abs_url).netloc != base_parsed.netloc:
-            continue
-        if abs_url in seen:
-            continue
-        if _strip_fragment(abs_url) == _strip_fragment(base_url):
-            continue
-        seen.add(abs_url)
-        links.append(abs_url)
-
-    return links
-
-
-def _extract_wikisource_title(soup: BeautifulSoup, content: Optional[Tag]) -> str:
-    h1 = soup.find("h1")
-    if h1 and h1.get_text(strip=True):
-        return h1.get_text(" ", strip=True)
-    if content:
-        heading = content.find(["h1", "h2", "h3", "h4", "h5", "h6"])
-        if heading and heading.get_text(strip=True):
-            return heading.get_text(" ", strip=True)
-    title_tag = soup.title.get_text(" ", strip=True) if soup.title else ""
-    return title_tag or "Capítulo"
-
-
-def _clean_wikisource_content(html_text: str, opt: ExtractOptions) -> tuple[str, str]:
-    soup = BeautifulSoup(html_text, "html.parser")
-    content = soup.select_one("#mw-content-text") or soup.select_one("div#content")
-    if content is None:
-        content = soup.body or soup
-
-    for bad in content.select(
-        ".mw-editsection, .toc, #toc, .navbox, .vertical-navbox, .metadata, "
-        ".sistersitebox, .authority-control, .mw-references-wrap, .reflist, "
-        ".reference, .catlinks, #catlinks, .printfooter, .noprint, .ws-noexport, "
-        ".hatnote, .thumb, .gallery, .ambox"
-    ):
-        bad.decompose()
-
-    title = _extract_wikisource_title(soup, content)
-    cleaned = extract_clean_text(str(content), opt)
-    if not cleaned:
-        return title, ""
-
-    lines = []
-    for line in cleaned.splitlines():
-        if any(noise in line.strip().lower() for noise in WIKISOURCE_TEXT_NOISE):
-            continue
-        lines.append(line)
-    filtered = "\n".join(lines).strip()
-    return title, (filtered + "\n" if filtered else "")
-
-
-def _format_wikisource_section(title: str, url: str, body: str) -> str:
-    return f"{body.rstrip()}\n\n"
-
-
-def _collect_wikisource_chapters(index_url: str, opt: ExtractOptions) -> list[tuple[str, str, str]]:
-    data = fetch_url_bytes(index_url)
-    html_text = decode_html_bytes(data)
-    first_level = extract_wikisource_chapter_links(html_text, index_url)
-    if not first_level:
-        return []
-
-    chapters: list[tuple[str, str, str]] = []
-    seen: set[str] = set()
-
-    for link in first_level:
-        if link in seen:
-            continue
-        seen.add(link)
-        render_url = _ensure_action_render(link)
-        volume_html = decode_html_bytes(fetch_url_bytes(render_url))
-        sublinks = extract_wikisource_chapter_links(volume_html, link)
-
-        if len(sublinks) >= 4:
-            for sublink in sublinks:
-                if sublink in seen:
-                    continue
-                seen.add(sublink)
-                sub_render = _ensure_action_render(sublink)
-                chapter_html = decode_html_bytes(fetch_url_bytes(sub_render))
-                title, body = _clean_wikisource_content(chapter_html, opt)
-                if body:
-                    chapters.append((title, sublink, body))
-        else:
-            title, body = _clean_wikisource_content(volume_html, opt)
-            if body:
-                chapters.append((title, link, body))
-
-    return chapters
+            text, msg, path = self.job(self.signals.status.emit)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(text, msg, path)
 
 
-# ------------------------------
-# UI
-# ------------------------------
-
 class GlassButton(QtWidgets.QPushButton):
     def __init__(self, text: str):
         super().__init__(text)
@@ -474,6 +89,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle("Gutenberg HTML → Clean TXT (UTF-8)")
         self.resize(980, 680)
         self._last_text: Optional[str] = None
+        self._last_path: Optional[pathlib.Path] = None  # set when the result was spilled to disk
+        self._worker: Optional[ExtractWorker] = None
         self._build_ui()
 
     def _build_ui(self):
@@ -627,7 +244,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_convert_file.setEnabled(not busy)
         self.btn_out.setEnabled(not busy)
         self.btn_wikisource.setEnabled(not busy)
-        self.btn_save.setEnabled((not busy) and bool(self._last_text))
+        self.btn_save.setEnabled((not busy) and bool(self._last_text or self._last_path))
         if msg:
             self.status.setText(msg)
 
@@ -647,6 +264,40 @@ class MainWindow(QtWidgets.QMainWindow):
                 path += ".txt"
             self.out_edit.setText(path)
 
+    def _start_worker(self, job, busy_msg: str) -> None:
+        self._set_busy(True, busy_msg)
+        worker = ExtractWorker(job)
+        worker.signals.status.connect(self.status.setText, QtCore.Qt.QueuedConnection)
+        worker.signals.finished.connect(self._on_worker_finished, QtCore.Qt.QueuedConnection)
+        worker.signals.error.connect(self._on_worker_error, QtCore.Qt.QueuedConnection)
+        self._worker = worker
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_worker_finished(self, text: str, msg: str, path: str) -> None:
+        self._worker = None
+        if text:
+            self._drop_result_file()
+            if path:
+                self._last_text = None
+                self._last_path = pathlib.Path(path)
+            else:
+                self._last_text = text
+            self.preview.setPlainText(text)
+        self._set_busy(False, msg)
+
+    def _drop_result_file(self) -> None:
+        if self._last_path is not None:
+            self._last_path.unlink(missing_ok=True)
+            self._last_path = None
+
+    def closeEvent(self, event):
+        self._drop_result_file()
+        super().closeEvent(event)
+
+    def _on_worker_error(self, msg: str) -> None:
+        self._worker = None
+        self._set_busy(False, f"Error: {msg}")
+
     def on_convert_file(self):
         path = self.file_edit.text().strip()
         if not path:
@@ -658,17 +309,14 @@ class MainWindow(QtWidgets.QMainWindow):
             self.status.setText("Ese archivo no existe.")
             return
 
-        self._set_busy(True, "Leyendo archivo…")
-        QtWidgets.QApplication.processEvents()
+        opt = self._options()
 
-        data = p.read_bytes()
-        html_text = decode_html_bytes(data)
-        cleaned = extract_clean_text(html_text, self._options())
+        def job(status):
+            html_text = decode_html_bytes(p.read_bytes())
+            cleaned = extract_clean_text(html_text, opt)
+            return cleaned, f"Convertido desde archivo. Líneas: {cleaned.count(chr(10))}", ""
 
-        self._last_text = cleaned
-        self.preview.setPlainText(cleaned)
-        self._set_busy(False, f"Convertido desde archivo. Líneas: {cleaned.count(chr(10))}")
-        self.btn_save.setEnabled(True)
+        self._start_worker(job, "Leyendo archivo…")
 
     def on_download_convert(self):
         url = self.url_edit.text().strip()
@@ -676,63 +324,73 @@ class MainWindow(QtWidgets.QMainWindow):
             self.status.setText("Pega un URL primero.")
             return
 
-        self._set_busy(True, "Descargando HTML…")
-        QtWidgets.QApplication.processEvents()
-
-        try:
-            data = fetch_url_bytes(url)
-        except Exception as e:
-            self._set_busy(False, f"Fallo descargando: {e}")
-            return
+        opt = self._options()
 
-        self._set_busy(True, "Decodificando + limpiando…")
-        QtWidgets.QApplication.processEvents()
+        def job(status):
+            try:
+                data = fetch_url_bytes(url)
+            except Exception as e:
+                return "", f"Fallo descargando: {e}", ""
 
-        html_text = decode_html_bytes(data)
-        cleaned = extract_clean_text(html_text, self._options())
+            status("Decodificando + limpiando…")
+            html_text = decode_html_bytes(data)
+            del data  # don't hold the raw bytes while parsing
+            cleaned = extract_clean_text(html_text, opt)
+            return cleaned, f"Listo. Caracteres: {len(cleaned):,} | Líneas: {cleaned.count(chr(10))}", ""
 
-        self._last_text = cleaned
-        self.preview.setPlainText(cleaned)
-        self._set_busy(False, f"Listo. Caracteres: {len(cleaned):,} | Líneas: {cleaned.count(chr(10))}")
-        self.btn_save.setEnabled(True)
+        self._start_worker(job, "Descargando HTML…")
 
     def on_download_wikisource(self):
         url = self.url_edit.text().strip()
         if not url:
             self.status.setText("Pega un URL primero.")
             return
-        if not _is_wikisource_url(url):
+        if not is_wikisource_url(url):
             self.status.setText("Ese URL no parece de Wikisource.")
             return
 
         self._download_wikisource_work(url)
 
     def _download_wikisource_work(self, index_url: str) -> None:
-        self._set_busy(True, "Descargando índice de Wikisource…")
-        QtWidgets.QApplication.processEvents()
-
-        try:
-            chapters = _collect_wikisource_chapters(index_url, self._options())
-        except Exception as e:
-            self._set_busy(False, f"Fallo descargando índice: {e}")
-            return
-
-        if not chapters:
-            self._set_busy(False, "No se encontraron capítulos en Wikisource.")
-            return
-
-        combined_parts = [
-            _format_wikisource_section(title, url, body)
-            for title, url, body in chapters
-        ]
-        combined = "".join(combined_parts).strip() + "\n"
-        self._last_text = combined
-        self.preview.setPlainText(combined)
-        self._set_busy(False, f"Wikisource completo. Capítulos: {len(chapters)} | Caracteres: {len(combined):,}")
-        self.btn_save.setEnabled(True)
+        opt = self._options()
+
+        def job(status):
+            # Write each chapter straight to a temp file, so memory holds the chapter
+            # being written plus the few pages fetched ahead of it, and the preview
+            # widget only gets the beginning of the book.
+            fd, path = tempfile.mkstemp(prefix="wikisource-", suffix=".txt")
+            count = chars = 0
+            try:
+                with open(fd, "w", encoding="utf-8", newline="\n") as f:
+                    pending = ""
+                    for title, url, body in iter_wikisource_chapters(index_url, opt, status):
+                        if pending:
+                            f.write(pending)
+                            chars += len(pending)
+                        pending = format_wikisource_section(title, url, body)
+                        count += 1
+                    # same as "".join(sections).strip() + "\n" (bodies never start with whitespace)
+                    pending = pending.rstrip() + "\n"
+                    f.write(pending)
+                    chars += len(pending)
+            except Exception as e:
+                pathlib.Path(path).unlink(missing_ok=True)
+                return "", f"Fallo descargando índice: {e}", ""
+
+            if not count:
+                pathlib.Path(path).unlink(missing_ok=True)
+                return "", "No se encontraron capítulos en Wikisource.", ""
+
+            with open(path, encoding="utf-8", newline="\n") as f:
+                preview = f.read(PREVIEW_CHARS + 1)
+            if len(preview) > PREVIEW_CHARS:
+                preview = preview[:PREVIEW_CHARS] + "\n… [vista previa truncada; se guarda el texto completo]"
+            return preview, f"Wikisource completo. Capítulos: {count} | Caracteres: {chars:,}", path
+
+        self._start_worker(job, "Descargando índice de Wikisource…")
 
     def on_save(self):
-        if not self._last_text:
+        if not (self._last_text or self._last_path):
             self.status.setText("Nada que guardar.")
             return
 
@@ -742,7 +400,10 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         try:
-            out_path.write_text(self._last_text, encoding="utf-8", newline="\n")
+            if self._last_path is not None:
+                shutil.copyfile(self._last_path, out_path)
+            else:
+                out_path.write_text(self._last_text, encoding="utf-8", newline="\n")
             self.status.setText(f"Guardado: {out_path} (UTF-8)")
         except Exception as e:
             self.status.setText(f"Error guardando: {e}")
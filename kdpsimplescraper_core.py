@@ -0,0 +1,732 @@
+"""
+Extraction core for kdpsimplescraper: Gutenberg HTML → clean TXT and whole
+Wikisource works, with no Qt dependency. The PySide6 window lives in
+kdpsimplescraper.py, which is also the entry point.
+
+Install:
+  pip install beautifulsoup4 charset-normalizer lxml
+  pip install selectolax  # optional, faster Wikisource link scan
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html as html_lib
+import itertools
+import re
+import threading
+import time
+import urllib.error
+from urllib.parse import urljoin, urlparse, urlunparse
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from bs4 import BeautifulSoup, CData, NavigableString, PageElement, SoupStrainer, Tag
+
+from kdpfetch import fetch_url_bytes
+
+try:
+    from charset_normalizer import from_bytes as cn_from_bytes
+except Exception:
+    cn_from_bytes = None
+
+# lxml is much faster than the pure-Python html.parser; use it when available.
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except Exception:
+    PARSER = "html.parser"
+
+# selectolax (Lexbor, C) for pure CSS-select paths that don't need bs4 semantics.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:
+    LexborHTMLParser = None
+
+
+# ------------------------------
+# Text utilities
+# ------------------------------
+
+MOJIBAKE_HINT_RE = re.compile(r"[ÃÂâ€˜â€™â€œâ€�â€¢â€¦]|\\x[0-9a-fA-F]{2}")
+MULTI_SPACE_RE = re.compile(r"[ ]{2,}")
+MULTI_NL_RE = re.compile(r"\n{3,}")
+QUAD_NL_RE = re.compile(r"\n{4,}")
+CR_RE = re.compile(r"\r\n?")
+# Not "\r": mapping it per char would turn CRLF into two newlines; see normalize_newlines.
+KEEPNL_SPACE_TRANS = str.maketrans({"\u00a0": " ", "\t": " ", "\f": " ", "\v": " "})
+
+
+def repair_mojibake(s: str) -> str:
+    """Repair classic 'UTF-8 bytes decoded as Latin-1' mojibake."""
+    if not s:
+        return s
+    # Pure ASCII can't be mojibake (and the roundtrip would be a no-op).
+    if s.isascii():
+        return s
+    # Anything above U+00FF can't survive the Latin-1 roundtrip. The encoder stops
+    # at the first such char (most real books have curly quotes), so check it
+    # before paying for a full regex scan of the document.
+    try:
+        raw = s.encode("latin-1", errors="strict")
+    except Exception:
+        return s
+    if not MOJIBAKE_HINT_RE.search(s):
+        return s
+    try:
+        repaired = raw.decode("utf-8", errors="strict")
+        return repaired
+    except Exception:
+        return s
+
+
+def normalize_newlines(s: str) -> str:
+    """CRLF / lone CR -> LF in one pass; no copy when there is no CR at all."""
+    if "\r" not in s:
+        return s
+    return CR_RE.sub("\n", s)
+
+
+def normalize_block_newlines(s: str) -> str:
+    """Newline cleanup for pre/blockquote/poetry text: LF endings, at most one blank line."""
+    return MULTI_NL_RE.sub("\n\n", normalize_newlines(s))
+
+
+def normalize_spaces_keep_newlines(s: str) -> str:
+    """Normalize whitespace but keep \n. Good for poetry/pre/quotes."""
+    if not s:
+        return s
+    s = s.translate(KEEPNL_SPACE_TRANS)  # NBSP, tabs, FF, VT -> space
+    s = normalize_newlines(s)
+    # collapse multiple spaces (not newlines)
+    s = MULTI_SPACE_RE.sub(" ", s)
+    return s
+
+
+def normalize_spaces_singleline(s: str) -> str:
+    """Normalize whitespace and collapse any newlines to spaces. Good for normal paragraphs."""
+    if not s:
+        return s
+    # split() with no args collapses every whitespace run (NBSP, \r\n, tabs) in C.
+    return " ".join(s.split())
+
+
+def strip_line(s: str) -> str:
+    return s.strip(" \t")
+
+
+# What get_text() returns for an ordinary tag: not comments or doctypes, nor the text
+# of <script>, <style>, <template>, <rt> and <rp>, which bs4 gives their own string types.
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+def tag_text(tag: Tag, sep: str = "", strip: bool = False) -> str:
+    """Same result as tag.get_text(sep, strip=strip) for any tag but those five containers.
+
+    get_text goes through two nested generators and an isinstance check per node;
+    this is called for every block in the book, so the plain loop adds up.
+    """
+    parts = []
+    for node in tag.descendants:
+        if type(node) in TEXT_STRING_TYPES:
+            if strip:
+                text = node.strip()
+                if text:
+                    parts.append(text)
+            else:
+                parts.append(node)
+    return sep.join(parts)
+
+
+# ------------------------------
+# Extraction options
+# ------------------------------
+
+@dataclass
+class ExtractOptions:
+    keep_br_as_newline: bool = True
+    preserve_preformatted: bool = True
+    preserve_poetry: bool = True
+    keep_footnotes: bool = True  # placeholder; you can wire this later
+
+
+POETRY_CLASS_HINTS = {"poetry", "verse", "stanza", "poem"}
+
+
+def looks_like_poetry_block(tag: Tag) -> bool:
+    # Gutenberg often: <div class="poem">, <div class="stanza"> or <p class="poetry">.
+    # Match whole class tokens, so e.g. "poetryless" doesn't count.
+    classes = tag.get("class")
+    if not classes:
+        return False
+    return not POETRY_CLASS_HINTS.isdisjoint(c.lower() for c in classes)
+
+
+# Scripts/styles/nav, plus images/figures (text-only export).
+DROP_TAG_NAMES = frozenset({"script", "style", "nav", "header", "footer", "img", "svg", "figure"})
+# Obvious PG header/footer blocks (on <div> only).
+DROP_DIV_IDS = frozenset({"pg-header", "pg-footer"})
+
+
+def remove_non_content(soup: Tag) -> None:
+    # One walk over the tree instead of three CSS selects; a dropped subtree
+    # is skipped as a whole. Works on any subtree: the walk stops where it ends.
+    if not soup.contents:
+        return
+    node = soup.contents[0]
+    end = _element_after(soup)
+    while node is not end:
+        if isinstance(node, Tag) and (
+            node.name in DROP_TAG_NAMES
+            or (node.name == "div" and node.get("id") in DROP_DIV_IDS)
+        ):
+            nxt = _element_after(node)
+            node.decompose()
+            node = nxt
+        else:
+            node = node.next_element
+
+
+def _element_after(node: PageElement) -> Optional[PageElement]:
+    """The first element past node and its descendants, in document order."""
+    while node is not None:
+        if node.next_sibling is not None:
+            return node.next_sibling
+        node = node.parent
+    return None
+
+
+# Candidate book containers, in priority order: ("id" | "class", value) on a <div>.
+MAIN_CONTAINER_SELECTORS = (
+    ("id", "body"), ("id", "main"), ("id", "content"), ("id", "pg-body"),
+    ("id", "book"), ("class", "book"), ("id", "text"), ("class", "text"),
+    ("id", "chapter"), ("class", "chapter"),
+)
+MAIN_CONTAINER_IDS = frozenset(v for k, v in MAIN_CONTAINER_SELECTORS if k == "id")
+MAIN_CONTAINER_CLASSES = frozenset(v for k, v in MAIN_CONTAINER_SELECTORS if k == "class")
+
+
+def select_main_container(soup: BeautifulSoup) -> Tag:
+    """Pick best container for actual book body; fallback to <body>."""
+    container = _pick_main_container(soup.find_all("div"))
+    if container is not None:
+        return container
+    return soup.body if soup.body else soup
+
+
+def _pick_main_container(divs: list[Tag]) -> Optional[Tag]:
+    # One pass over the <div>s records the first match for every candidate,
+    # instead of a full CSS-select walk per selector.
+    first: dict[tuple[str, str], Tag] = {}
+    for div in divs:
+        div_id = div.get("id")
+        if div_id in MAIN_CONTAINER_IDS:
+            first.setdefault(("id", div_id), div)
+        for c in div.get("class") or ():
+            if c in MAIN_CONTAINER_CLASSES:
+                first.setdefault(("class", c), div)
+
+    for key in MAIN_CONTAINER_SELECTORS:
+        t = first.get(key)
+        if t and len(tag_text(t, strip=True)) > 1000:
+            return t
+    return None
+
+
+# ------------------------------
+# Core extraction
+# ------------------------------
+
+NESTED_BLOCK_TAGS = ["h1","h2","h3","h4","h5","p","pre","blockquote","ul","ol","hr"]
+
+# Extraction only ever looks inside <body>: skip building <head> (Gutenberg
+# pages carry large <style> blocks there). lxml always implies a <body>, even
+# for fragments; html.parser does not, so it parses everything.
+BODY_ONLY = SoupStrainer("body") if PARSER == "lxml" else None
+
+# Small LRU for repeat conversions (re-clicking Convert, reloading the same file).
+# Keys are content digests, so the big input strings themselves aren't retained.
+_RESULT_CACHE_SIZE = 8
+_result_cache: OrderedDict[tuple, str] = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _content_key(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _cache_get(key: tuple) -> Optional[str]:
+    with _result_cache_lock:
+        value = _result_cache.get(key)
+        if value is not None:
+            _result_cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key: tuple, value: str) -> None:
+    with _result_cache_lock:
+        _result_cache[key] = value
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def extract_clean_text(html_text: str, opt: ExtractOptions) -> str:
+    """Convert Gutenberg-ish HTML into clean TXT while preserving structure."""
+
+    key = ("clean", _content_key(html_text.encode("utf-8", "surrogatepass")), astuple(opt))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    out = _extract_clean_text(html_text, opt)
+    _cache_put(key, out)
+    return out
+
+
+def _extract_clean_text(html_text: str, opt: ExtractOptions) -> str:
+    html_text = repair_mojibake(html_text)
+
+    soup = BeautifulSoup(html_text, PARSER, parse_only=BODY_ONLY)
+    remove_non_content(soup)
+    return _blocks_to_text(select_main_container(soup).contents, opt)
+
+
+def _blocks_to_text(top: list, opt: ExtractOptions) -> str:
+    """Clean TXT for the block tags in `top` (a container's children) and below."""
+    blocks: list[str] = []
+    section_break = False
+
+    def add_block(text_in: str, preserve_newlines: bool) -> None:
+        nonlocal section_break
+        if not text_in:
+            return
+        t = html_lib.unescape(text_in)
+        t = repair_mojibake(t)
+
+        if preserve_newlines:
+            t = normalize_spaces_keep_newlines(t)
+            lines = [strip_line(x) for x in t.split("\n")]
+            # trim outer empty lines with one slice
+            start, end = 0, len(lines)
+            while start < end and not lines[start]:
+                start += 1
+            if start == end:
+                return
+            while not lines[end - 1]:
+                end -= 1
+            block = "\n".join(lines[start:end])
+            # reduce excessive blank lines, then strip trailing spaces per line
+            if "\n\n\n\n" in block:
+                block = QUAD_NL_RE.sub("\n\n\n", block)
+            block = "\n".join([line.rstrip() for line in block.split("\n")])
+        else:
+            block = normalize_spaces_singleline(t)
+            if not block:
+                return
+
+        # An <hr> between blocks becomes one extra blank line, however many there are.
+        if section_break and blocks:
+            block = "\n" + block
+        section_break = False
+        blocks.append(block)
+
+    # Block handlers, dispatched on the tag name. Each returns True if the tag's
+    # whole subtree is accounted for.
+    def handle_heading(tag: Tag) -> bool:
+        txt = tag_text(tag, " ", strip=True)
+        if txt:
+            add_block(txt.upper() if len(txt) <= 80 else txt, preserve_newlines=False)
+        return True
+
+    def handle_hr(tag: Tag) -> bool:
+        nonlocal section_break
+        section_break = True
+        return True
+
+    def handle_list(tag: Tag) -> bool:
+        items = []
+        for li in tag.find_all("li", recursive=False):
+            it = tag_text(li, " ", strip=True)
+            if it:
+                items.append(f"- {it}")
+        if items:
+            add_block("\n".join(items), preserve_newlines=True)
+        # Only <li> text was taken; stray child tags still need their own visit.
+        return all(child.name == "li" for child in tag.children if isinstance(child, Tag))
+
+    def handle_pre(tag: Tag) -> bool:
+        if opt.preserve_preformatted:
+            add_block(normalize_block_newlines(tag_text(tag, "\n", strip=False)), preserve_newlines=True)
+            return True
+        return handle_poetry(tag)
+
+    def handle_blockquote(tag: Tag) -> bool:
+        add_block(normalize_block_newlines(tag_text(tag, "\n", strip=False)), preserve_newlines=True)
+        return True
+
+    # Poetry-like blocks
+    def handle_poetry(tag: Tag) -> bool:
+        if opt.preserve_poetry and looks_like_poetry_block(tag):
+            # keep <br> as newline
+            add_block(normalize_block_newlines(tag_text(tag, "\n", strip=False)), preserve_newlines=True)
+            return True
+        return False
+
+    # paragraph-ish: p and some divs
+    def handle_paragraph(tag: Tag) -> bool:
+        if handle_poetry(tag):
+            return True
+        # Avoid flattening container divs that hold other blocks directly
+        if tag.name == "div":
+            nested = tag.find(NESTED_BLOCK_TAGS, recursive=True)
+            if nested is not None:
+                return False  # container: walk into its blocks
+
+        if opt.keep_br_as_newline and tag.find("br") is not None:
+            txt = tag_text(tag, "\n", strip=False)
+            add_block(txt, preserve_newlines=True)
+        else:
+            # IMPORTANT: do NOT preserve accidental newlines inside paragraph.
+            txt = tag_text(tag, " ", strip=False)
+            add_block(txt, preserve_newlines=False)
+        return True
+
+    handlers = dict.fromkeys(("h1", "h2", "h3", "h4", "h5"), handle_heading)
+    handlers.update(
+        hr=handle_hr, ul=handle_list, ol=handle_list, pre=handle_pre,
+        blockquote=handle_blockquote, p=handle_paragraph, div=handle_paragraph,
+    )
+
+    # Safer traversal: process only meaningful block tags in document order.
+    # Pre-order walk that skips the subtree of any block a handler already emitted
+    # in full, so nested blocks (li > ul, poem > stanza, blockquote > p) aren't repeated.
+    stack = top[::-1]
+    while stack:
+        el = stack.pop()
+        if isinstance(el, Tag):
+            fn = handlers.get(el.name)
+            if fn is not None and fn(el):
+                continue
+            stack.extend(el.contents[::-1])
+
+    # Stitch with blank lines between blocks
+    return "\n\n".join(blocks).strip() + "\n"
+
+
+# ------------------------------
+# Download / load helpers
+# ------------------------------
+
+# charset_normalizer cost grows with input size and candidate count.
+CHARSET_SNIFF_BYTES = 64 * 1024
+CHARSET_CANDIDATES = ["cp1252", "latin_1", "iso8859_15", "utf_16"]
+
+
+def decode_html_bytes(data: bytes) -> str:
+    """Decode bytes robustly, favoring UTF-8 (what Gutenberg uses)."""
+
+    key = ("decode", _content_key(data))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    text = _decode_html_bytes(data)
+    _cache_put(key, text)
+    return text
+
+
+def _decode_html_bytes(data: bytes) -> str:
+    try:
+        return data.decode("utf-8", errors="strict")
+    except Exception:
+        pass
+
+    if cn_from_bytes is not None:
+        try:
+            # UTF-8 already failed; sniff a prefix among the encodings non-UTF-8
+            # books actually use, then decode the whole payload with the winner.
+            best = cn_from_bytes(data[:CHARSET_SNIFF_BYTES], cp_isolation=CHARSET_CANDIDATES).best()
+            if best is not None:
+                return data.decode(best.encoding, errors="replace")
+        except Exception:
+            pass
+
+    return data.decode("cp1252", errors="replace")
+
+
+WIKISOURCE_EXCLUDED_NAMESPACES = {
+    "special",
+    "help",
+    "file",
+    "category",
+    "talk",
+    "template",
+    "portal",
+}
+# Anchored "namespace:" test for link titles, equivalent to lowercasing the
+# prefix and looking it up in the set. ASCII-only folding keeps re from also
+# matching "ſ"/"ı"; the Kelvin sign is the one non-ASCII char str.lower() maps to "k".
+WIKISOURCE_EXCLUDED_NS_RE = re.compile(
+    "(?:" + "|".join(sorted(WIKISOURCE_EXCLUDED_NAMESPACES)).replace("k", "[k\u212a]") + "):",
+    re.I | re.A,
+)
+
+WIKISOURCE_TEXT_NOISE = (
+    "retrieved from",
+    "public domain",
+    "categories",
+)
+
+
+# Matches the connection pool size in kdpfetch.
+WIKISOURCE_FETCH_WORKERS = 8
+# Per-page retries for transient failures (timeouts, 5xx, 429); delay doubles each time.
+WIKISOURCE_FETCH_ATTEMPTS = 3
+WIKISOURCE_RETRY_DELAY = 0.5
+
+
+@lru_cache(maxsize=4096)
+def _cached_urlparse(url: str):
+    # ParseResult is an immutable namedtuple, so sharing cached results is safe.
+    return urlparse(url)
+
+
+@lru_cache(maxsize=4096)
+def _strip_fragment(url: str) -> str:
+    parsed = _cached_urlparse(url)
+    return urlunparse(parsed._replace(fragment=""))
+
+
+def _ensure_action_render(url: str) -> str:
+    parsed = _cached_urlparse(url)
+    query = parsed.query
+    if "action=render" in query:
+        return url
+    new_query = f"{query}&action=render" if query else "action=render"
+    return urlunparse(parsed._replace(query=new_query))
+
+
+def is_wikisource_url(url: str) -> bool:
+    parsed = _cached_urlparse(url)
+    host = parsed.netloc.lower()
+    return host == "wikisource.org" or host.endswith(".wikisource.org")
+
+
+# action=render pages are just the content fragment, so every link counts and a
+# regex scan can stand in for a full parse. Pages with a content container keep the DOM path.
+WIKISOURCE_CONTAINER_RE = re.compile(r"""\bid\s*=\s*["']?(?:mw-content-text|content)\b""", re.I)
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+HREF_RE = re.compile(
+    r"""<a\s[^>]*?(?<![\w-])href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.I,
+)
+
+
+def _content_hrefs(html_text: str) -> list[str]:
+    """Raw href of every <a href> inside the Wikisource content area, in document order."""
+    if not WIKISOURCE_CONTAINER_RE.search(html_text):
+        text = HTML_COMMENT_RE.sub("", html_text) if "<!--" in html_text else html_text
+        return [html_lib.unescape(m.group(m.lastindex)) for m in HREF_RE.finditer(text)]
+
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html_text)
+        container = tree.css_first("#mw-content-text") or tree.css_first("div#content") or tree.root
+        if container is None:
+            return []
+        return [a.attributes.get("href") or "" for a in container.css("a[href]")]
+
+    soup = BeautifulSoup(html_text, PARSER)
+    container = soup.select_one("#mw-content-text") or soup.select_one("div#content") or soup
+    return [a.get("href", "") for a in container.select("a[href]")]
+
+
+def extract_wikisource_chapter_links(html_text: str, base_url: str) -> list[str]:
+    base_parsed = _cached_urlparse(base_url)
+    base_stripped = _strip_fragment(base_url)
+    base_root = f"{base_parsed.scheme}://{base_parsed.netloc}"
+    links: list[str] = []
+    seen: set[str] = set()
+
+    for href in _content_hrefs(html_text):
+        href = href.strip()
+        if not href:
+            continue
+        if href.startswith("/wiki/"):
+            href = href
+        elif href.startswith(base_root + "/wiki/"):
+            href = href[len(base_root):]
+        else:
+            continue
+
+        href = _strip_fragment(href)
+        title = href.split("/wiki/", 1)[-1]
+        if WIKISOURCE_EXCLUDED_NS_RE.match(title):
+            continue
+
+        abs_url = urljoin(base_root, href)
+        if _cached_urlparse(abs_url).netloc != base_parsed.netloc:
+            continue
+        if abs_url in seen:
+            continue
+        if _strip_fragment(abs_url) == base_stripped:
+            continue
+        seen.add(abs_url)
+        links.append(abs_url)
+
+    return links
+
+
+def _extract_wikisource_title(soup: BeautifulSoup, content: Optional[Tag]) -> str:
+    h1 = soup.find("h1")
+    if h1 and h1.get_text(strip=True):
+        return h1.get_text(" ", strip=True)
+    if content:
+        heading = content.find(["h1", "h2", "h3", "h4", "h5", "h6"])
+        if heading and heading.get_text(strip=True):
+            return heading.get_text(" ", strip=True)
+    title_tag = soup.title.get_text(" ", strip=True) if soup.title else ""
+    return title_tag or "Capítulo"
+
+
+def _clean_wikisource_content(html_text: str, opt: ExtractOptions) -> tuple[str, str]:
+    soup = BeautifulSoup(html_text, PARSER)
+    content = soup.select_one("#mw-content-text") or soup.select_one("div#content")
+    if content is None:
+        content = soup.body or soup
+
+    for bad in content.select(
+        ".mw-editsection, .toc, #toc, .navbox, .vertical-navbox, .metadata, "
+        ".sistersitebox, .authority-control, .mw-references-wrap, .reflist, "
+        ".reference, .catlinks, #catlinks, .printfooter, .noprint, .ws-noexport, "
+        ".hatnote, .thumb, .gallery, .ambox"
+    ):
+        bad.decompose()
+
+    title = _extract_wikisource_title(soup, content)
+    cleaned = _clean_wikisource_subtree(content, opt)
+    if not cleaned:
+        return title, ""
+
+    # Lowercase once for the whole text instead of strip()+lower() per line.
+    lines = []
+    for line, low in zip(cleaned.splitlines(), cleaned.lower().splitlines()):
+        if any(noise in low for noise in WIKISOURCE_TEXT_NOISE):
+            continue
+        lines.append(line)
+    filtered = "\n".join(lines).strip()
+    return title, (filtered + "\n" if filtered else "")
+
+
+def _clean_wikisource_subtree(content: Tag, opt: ExtractOptions) -> str:
+    """Clean TXT for `content`, walked where it was parsed instead of serialized and parsed again.
+
+    Output can differ from extract_clean_text(str(content), opt) in three ways:
+    - mojibake is only repaired block by block, never over the whole fragment first;
+    - whitespace-only text left between two removed elements is kept, where
+      libxml2 would drop it (only visible inside <pre>);
+    - a page without <body> is still walked, where the reparse found nothing.
+    """
+    # A reparse would see the text on both sides of the removed junk as one string.
+    content.smooth()
+    remove_non_content(content)
+    # As after a reparse, the content element itself is a candidate container.
+    divs = content.find_all("div")
+    if content.name == "div":
+        divs.insert(0, content)
+    container = _pick_main_container(divs)
+    if container is not None:
+        return _blocks_to_text(container.contents, opt)
+    if content.name in ("body", "[document]"):
+        return _blocks_to_text(content.contents, opt)
+    return _blocks_to_text([content], opt)
+
+
+def format_wikisource_section(title: str, url: str, body: str) -> str:
+    return f"{body.rstrip()}\n\n"
+
+
+def _fetch_render_html(url: str) -> str:
+    render_url = _ensure_action_render(url)
+    delay = WIKISOURCE_RETRY_DELAY
+    for _ in range(WIKISOURCE_FETCH_ATTEMPTS - 1):
+        try:
+            return decode_html_bytes(fetch_url_bytes(render_url))
+        except urllib.error.HTTPError as e:
+            # 4xx (other than rate limiting) won't change on retry.
+            if e.code < 500 and e.code != 429:
+                raise
+        except Exception:
+            pass
+        time.sleep(delay)
+        delay *= 2
+    return decode_html_bytes(fetch_url_bytes(render_url))
+
+
+def iter_wikisource_chapters(
+    index_url: str, opt: ExtractOptions, progress=None
+) -> Iterator[tuple[str, str, str]]:
+    """Yield (title, url, body) in reading order.
+
+    Pages are downloaded at most WIKISOURCE_FETCH_WORKERS ahead of the consumer and
+    each one is cleaned and dropped when reached, so memory stays bounded.
+    """
+    # Keep neither the index bytes nor already-cleaned pages alive for the whole crawl.
+    first_level = extract_wikisource_chapter_links(
+        decode_html_bytes(fetch_url_bytes(index_url)), index_url
+    )
+    if not first_level:
+        return
+
+    # Downloads are latency-bound, so fetch in parallel, but only a few pages ahead
+    # of the reader: each page is cleaned and yielded as soon as it is reached.
+    done = itertools.count(1)  # next() is atomic under the GIL
+
+    def fetch_chapter(url: str) -> str:
+        page = _fetch_render_html(url)
+        if progress is not None:
+            progress(f"Descargando capítulos… {next(done)}")
+        return page
+
+    seen: set[str] = set()
+    with ThreadPoolExecutor(max_workers=WIKISOURCE_FETCH_WORKERS) as pool:
+        volumes = _prefetch_in_order(pool, _fetch_render_html, first_level, WIKISOURCE_FETCH_WORKERS)
+        for link, volume_html in zip(first_level, volumes):
+            if link in seen:
+                continue
+            seen.add(link)
+            sublinks = extract_wikisource_chapter_links(volume_html, link)
+
+            if len(sublinks) < 4:
+                title, body = _clean_wikisource_content(volume_html, opt)
+                if body:
+                    yield title, link, body
+                continue
+
+            del volume_html
+            chapters = [url for url in dict.fromkeys(sublinks) if url not in seen]
+            seen.update(chapters)
+            pages = _prefetch_in_order(pool, fetch_chapter, chapters, WIKISOURCE_FETCH_WORKERS)
+            for url, page in zip(chapters, pages):
+                title, body = _clean_wikisource_content(page, opt)
+                del page
+                if body:
+                    yield title, url, body
+
+
+def _prefetch_in_order(pool: ThreadPoolExecutor, fn, items, ahead: int) -> Iterator:
+    """Yield fn(item) for each item, in order, with at most `ahead` calls submitted ahead."""
+    items = iter(items)
+    window = deque(pool.submit(fn, item) for item in itertools.islice(items, ahead))
+    try:
+        while window:
+            result = window.popleft().result()
+            for item in itertools.islice(items, 1):
+                window.append(pool.submit(fn, item))
+            yield result
+    finally:
+        for future in window:
+            future.cancel()
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from kdp1 import BookCleaner, BookExtractor, BookFetcher
+
+
+def extract(html: str) -> str:
+    return BookCleaner.clean_text(BookExtractor.extract_main_text(html))
+
+
+def test_generic_extract_keeps_text_around_dropped_elements_apart():
+    html = "<html><body><p>a<nav>n</nav>b</p><p>c<script>s()</script>d</p></body></html>"
+    assert extract(html) == "a b\n\nc d\n"
+
+
+def test_marker_chunk_keeps_text_around_script_apart():
+    html = (
+        "<html><body><p>front</p>"
+        "<p>*** START OF THE PROJECT GUTENBERG EBOOK X ***</p>"
+        "<p>a<script>x()</script>b</p>"
+        "<p>*** END OF THE PROJECT GUTENBERG EBOOK X ***</p></body></html>"
+    )
+    assert extract(html) == "a\nb\n"
+
+
+def test_comments_separate_text_in_marker_chunk():
+    html = (
+        "<html><body><p>*** START OF THE PROJECT GUTENBERG EBOOK X ***</p>"
+        "<p>Hello<!-- c -->world</p>"
+        "<p>*** END OF THE PROJECT GUTENBERG EBOOK X ***</p></body></html>"
+    )
+    assert extract(html) == "Hello\nworld\n"
+
+
+def test_comments_separate_text_when_markers_span_tags():
+    # "<b>***</b> START" only matches in the extracted text: the full-text path.
+    html = (
+        "<html><body><p>front</p>"
+        "<p><b>***</b> START OF THE PROJECT GUTENBERG EBOOK X ***</p>"
+        "<p>Hello<!-- c -->world</p><p>a<style>p{}</style>b</p>"
+        "<p><b>***</b> END OF THE PROJECT GUTENBERG EBOOK X ***</p></body></html>"
+    )
+    assert extract(html) == "Hello\nworld\na\nb\n"
+
+
+def test_comments_separate_text_in_generic_extract():
+    html = "<html><body><h2>world  <!-- c -->tail</h2><p>x<!-- c -->y</p></body></html>"
+    assert extract(html) == "WORLD TAIL\n\nx y\n"
+
+
+def test_meta_latin1_label_is_read_as_cp1252():
+    for label in (b"iso-8859-1", b"latin1", b"us-ascii"):
+        data = b'<meta charset="' + label + b'"><p>\x93wait\x85\x94 \x97 caf\xe9</p>'
+        text = BookFetcher._decode_with_meta_charset(data)
+        assert text.endswith("<p>“wait…” — café</p>")
+
+
+def test_clean_text_only_breaks_lines_at_newlines():
+    text = "uno\x85dos tres\x0ccuatro\r\ncinco\rseis"
+    assert BookCleaner.clean_text(text) == "uno\x85dos tres\x0ccuatro\ncinco\nseis\n"
@@ -0,0 +1,42 @@
+import os
+import stat
+import time
+
+import kdpfetch
+
+
+def test_cache_is_pruned_by_age_and_size(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "fetch"
+    monkeypatch.setattr(kdpfetch, "FETCH_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(kdpfetch, "FETCH_CACHE_MAX_BYTES", 10)
+    monkeypatch.setattr(kdpfetch, "_cache_pruned", False)
+    monkeypatch.setattr(kdpfetch, "download", lambda url, timeout, headers: (b"new", {}))
+
+    cache_dir.mkdir()
+    old = time.time() - kdpfetch.FETCH_CACHE_KEEP - 60
+    for name, size, mtime in (("stale", 1, old), ("big", 8, None), ("recent", 4, None)):
+        path = cache_dir / name
+        path.write_bytes(b"x" * size)
+        (cache_dir / f"{name}.json").write_text("{}")
+        if mtime is None:
+            mtime = time.time() - (100 if name == "big" else 50)
+        os.utime(path, (mtime, mtime))
+
+    assert kdpfetch.fetch_url_bytes("https://example.org/a") == b"new"
+
+    names = {p.name for p in cache_dir.iterdir()}
+    # "stale" is past FETCH_CACHE_KEEP; "big" is the oldest once "recent" fills the budget.
+    assert "stale" not in names and "stale.json" not in names
+    assert "big" not in names and "big.json" not in names
+    assert {"recent", "recent.json"} <= names
+    assert len(names) == 4  # plus the new entry and its sidecar
+
+
+def test_cache_dir_is_created_private(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "kdp_cache" / "fetch"
+    monkeypatch.setattr(kdpfetch, "FETCH_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(kdpfetch, "download", lambda url, timeout, headers: (b"body", {}))
+
+    assert kdpfetch.fetch_url_bytes("https://example.org/a") == b"body"
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    assert kdpfetch.fetch_url_bytes("https://example.org/a") == b"body"
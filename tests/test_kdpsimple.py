@@ -0,0 +1,33 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import kdpsimple
+
+
+def test_remove_non_content_drops_whole_subtrees():
+    soup = BeautifulSoup(
+        "<body><div id='pg-header'><p>h</p><img src=a></div><p>a<nav>n<b>m</b></nav>b</p>"
+        "<figure><svg></svg></figure><p>c</p><script>s()</script></body>",
+        kdpsimple.PARSER,
+    )
+    kdpsimple.remove_non_content(soup)
+    assert str(soup.body) == "<body><p>ab</p><p>c</p></body>"
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        "Ã©",
+        "&Atilde;&copy;",
+        "&#195;&#169;",
+        "&#xC3;&#xA9;",
+        "&#xc3;&#xa9;",
+        "&amp;Atilde;&amp;copy;",
+        "&amp;#195;&amp;#169;",
+        "Ã&copy;",
+    ],
+)
+def test_mojibake_in_any_reference_form_is_repaired(encoded):
+    html = f"<html><body><p>caf{encoded}</p><p>plain “text”</p></body></html>"
+    assert kdpsimple.extract_clean_text(html, kdpsimple.ExtractOptions()) == "café\n\nplain “text”\n"
+
@@ -0,0 +1,58 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import kdpsimplescraper_core as ks
+
+WORDS = "palabra " * 150
+
+PAGES = [
+    # Reference marks and edit links removed from the middle of running text.
+    '<div class="mw-parser-output"><h2>Capítulo I<span class="mw-editsection">[editar]</span></h2>'
+    '<p>Era<sup class="reference">[1]</sup> una vez.</p><p>Otra<span class="noprint"> x</span> línea.</p></div>',
+    # Preformatted text and poems, where every string is kept as written.
+    '<div class="mw-parser-output"><pre>uno<sup class="reference">1</sup>\n  dos\n</pre>'
+    '<div class="poem"><p>verso uno<br>\nverso<span class="mw-editsection">[e]</span> dos</p></div></div>',
+    # A main container long enough to be picked, surrounded by junk.
+    f'<div id="mw-content-text"><div class="navbox">nav</div><div class="text"><p>{WORDS}</p>'
+    f'<div class="toc">índice</div><p>fin<sup class="reference">2</sup>al</p></div><p>fuera</p></div>',
+]
+
+
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("opt", [ks.ExtractOptions(), ks.ExtractOptions(preserve_preformatted=False, preserve_poetry=False)])
+def test_in_place_cleaning_matches_reparse(page, opt):
+    def content_of(html):
+        soup = BeautifulSoup(html, ks.PARSER)
+        content = soup.select_one("#mw-content-text") or soup.body
+        for bad in content.select(".mw-editsection, .navbox, .toc, .reference, .noprint"):
+            bad.decompose()
+        return content
+
+    ks._result_cache.clear()
+    expected = ks.extract_clean_text(str(content_of(page)), opt)
+    assert ks._clean_wikisource_subtree(content_of(page), opt) == expected
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<p>a <b>b</b><!-- c --> <i> d </i>e</p>",
+        "<p>x<script>s()</script><style>p{}</style><ruby>漢<rt>kan</rt></ruby><![CDATA[cd]]>y</p>",
+        "<div><p>one</p>\n<ul><li>two<br>three</li></ul><template><p>t</p></template></div>",
+        "<p></p>",
+    ],
+)
+def test_tag_text_matches_get_text(html):
+    tag = BeautifulSoup(html, ks.PARSER).body.contents[0]
+    for sep, strip in (("", False), (" ", True), ("\n", False)):
+        assert ks.tag_text(tag, sep, strip) == tag.get_text(sep, strip=strip)
+
+
+def test_remove_non_content_stays_inside_the_subtree():
+    soup = BeautifulSoup(
+        "<div id='a'>x<nav>n<img src=i></nav>y<div id='pg-footer'>f</div></div><script>s()</script>",
+        ks.PARSER,
+    )
+    ks.remove_non_content(soup.find(id="a"))
+    assert str(soup.find(id="a")) == '<div id="a">xy</div>'
+    assert soup.script is not None